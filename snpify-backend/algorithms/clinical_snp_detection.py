@@ -10,10 +10,11 @@ import random
 
 # Import enhanced components with fallback
 try:
-    from utils.population_database import PopulationFrequencyDB, PopulationGroup
+    from utils.population_database import PopulationFrequencyDB, PopulationGroup, POP_DB
     POPULATION_DB_AVAILABLE = True
 except ImportError:
     PopulationFrequencyDB = None
+    POP_DB = None
     PopulationGroup = None
     POPULATION_DB_AVAILABLE = False
 
@@ -225,7 +226,7 @@ class OptimizedClinicalVariantCaller:
         self.chromosome = "17" if gene == "BRCA1" else "13"
         
         # Initialize population database if available
-        self.population_db = PopulationFrequencyDB() if POPULATION_DB_AVAILABLE else None
+        self.population_db = POP_DB if POPULATION_DB_AVAILABLE else None
         
         # Load domains if available
         self.domains = BRCA1_DOMAINS if gene == "BRCA1" and DOMAINS_AVAILABLE else []
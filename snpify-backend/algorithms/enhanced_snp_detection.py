@@ -8,10 +8,11 @@ from datetime import datetime
 import uuid
 
 try:
-    from utils.population_database import PopulationFrequencyDB, PopulationGroup
+    from utils.population_database import PopulationFrequencyDB, PopulationGroup, POP_DB
     from data.enhanced_reference_sequences import BRCA1_DOMAINS, BRCA2_DOMAINS
 except ImportError:
     PopulationFrequencyDB = None
+    POP_DB = None
     BRCA1_DOMAINS = []
     BRCA2_DOMAINS = []
 
@@ -198,7 +199,7 @@ class ClinicalVariantCaller:
         self.chromosome = "17" if gene == "BRCA1" else "13"
         
         # Initialize population database
-        self.population_db = PopulationFrequencyDB() if PopulationFrequencyDB else None
+        self.population_db = POP_DB
         
         # Load domain information
         self.domains = BRCA1_DOMAINS if gene == "BRCA1" else BRCA2_DOMAINS
@@ -1,18 +1,29 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, Response
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List, Dict, Any, Literal
+from typing import Optional, List, Dict, Any, Literal, Union
 import uuid
 import time
+import functools
 import asyncio
 import json
+import re
 import logging
 from datetime import datetime
 from pathlib import Path
 import os
-import traceback
+import string
+from enum import Enum
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import orjson
+from starlette.background import BackgroundTask
 from mangum import Mangum
+import aiofiles
 
 # Configure logging
 logging.basicConfig(
@@ -48,7 +59,7 @@ except ImportError:
     logger.warning("⚠️ File validator not available")
 
 try:
-    from utils.fasta_parser import parse_fasta_file_content, FASTAParser
+    from utils.fasta_parser import parse_fasta_file_content, parse_fasta_file, FASTAParser
     FASTA_PARSER_AVAILABLE = True
     logger.info("✅ FASTA parser available")
 except ImportError:
@@ -63,17 +74,95 @@ except ImportError:
     STRING_MATCHING_AVAILABLE = False
     logger.warning("⚠️ String matching algorithms not available")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+    logger.info("✅ Numba JIT available")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("ℹ️ Numba not available - using translate-based sequence cleaning")
+
 # Basic reference sequences
 BRCA1_REFERENCE = "ATGGATTTATCTGCTCTTCGCGTTGAAGAAGTACAAAATGTCATTAATGCTATGCAGAAAATCTTAGAGTGTCCCATCT" * 10
 BRCA2_REFERENCE = "ATGCCTATTGGATCCAAAGAGAGGCCAACATTTTTTGAAATTTTTAAGACACGCTGCGACGTTTTCCACTCAACCCCTC" * 10
 
+# IUPAC nucleotide codes accepted in input sequences
+VALID_NUCLEOTIDES = 'ATGCNRYSWKMBDHV'
+
+class _IUPACTranslationTable(dict):
+    """str.translate table that drops every character without an explicit mapping"""
+    def __missing__(self, key):
+        return None
+
+# Upper-cases IUPAC codes and deletes everything else in a single C-level pass
+_CLEAN_TRANS_UPPER = _IUPACTranslationTable(
+    {ord(c): c for c in VALID_NUCLEOTIDES} | {ord(c.lower()): c for c in VALID_NUCLEOTIDES}
+)
+_N_TO_A_TRANS = str.maketrans('N', 'A')
+# Upper-cases ASCII letters and strips all whitespace in one pass
+_WS_DELETE_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase, string.whitespace)
+
+def _seq_stats(sequence: str) -> tuple[int, int, int]:
+    """Return (length, G+C count, N count) from a single vectorized pass"""
+    bases = np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)
+    gc_count = int(((bases == 0x47) | (bases == 0x43)).sum())
+    n_count = int((bases == 0x4E).sum())
+    return len(bases), gc_count, n_count
+
+def _significance_counts(variants: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count clinical significance classes of the variants"""
+    return dict(Counter(v.get('clinical_significance', 'UNCERTAIN_SIGNIFICANCE') for v in variants))
+
+# Byte -> upper-case IUPAC code (0 = drop), shared by the JIT cleaning kernel
+_IUPAC_LUT = np.zeros(256, dtype=np.uint8)
+for _base in VALID_NUCLEOTIDES:
+    _IUPAC_LUT[ord(_base)] = ord(_base)
+    _IUPAC_LUT[ord(_base.lower())] = ord(_base)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _clean_and_count_kernel(raw, lut):
+        """Single pass: upper-case, drop non-IUPAC bytes, count G/C/N and emit A for N"""
+        out = np.empty(raw.shape[0], dtype=np.uint8)
+        size = 0
+        gc_count = 0
+        n_count = 0
+        for i in range(raw.shape[0]):
+            b = lut[raw[i]]
+            if b == 0:
+                continue
+            if b == 0x47 or b == 0x43:
+                gc_count += 1
+            elif b == 0x4E:
+                n_count += 1
+                b = 0x41
+            out[size] = b
+            size += 1
+        return out[:size], gc_count, n_count
+
+def _clean_and_count(sequence: str) -> tuple[str, int, int]:
+    """Clean a raw sequence and replace N with A.
+
+    Returns (preprocessed_sequence, gc_count, n_count), where the counts refer
+    to the cleaned sequence before N->A replacement.
+    """
+    if NUMBA_AVAILABLE:
+        raw = np.frombuffer(sequence.encode('utf-8'), dtype=np.uint8)
+        cleaned, gc_count, n_count = _clean_and_count_kernel(raw, _IUPAC_LUT)
+        return cleaned.tobytes().decode('ascii'), int(gc_count), int(n_count)
+
+    cleaned_sequence = sequence.translate(_CLEAN_TRANS_UPPER)
+    _, gc_count, n_count = _seq_stats(cleaned_sequence)
+    return cleaned_sequence.translate(_N_TO_A_TRANS), gc_count, n_count
+
 # Initialize FastAPI app
 app = FastAPI(
     title="SNPify Clinical-Grade API (Complete)",
     description="Clinical-grade SNP Analysis with <1% false positive rate",
     version="3.1.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 handler = Mangum(app)
@@ -108,11 +197,104 @@ class SequenceAnalysisRequest(BaseModel):
     quality_scores: Optional[List[int]] = Field(default=None, description="Per-base quality scores")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
+class ExportFormat(str, Enum):
+    """Formats served by the generic export route (PDF has its own route)"""
+    json = "json"
+    csv = "csv"
+    xml = "xml"
+
+# Storage records
+@dataclass(slots=True)
+class ProgressRecord:
+    """Live progress of one analysis (updated on every pipeline step)"""
+    current_step: str
+    progress: float
+    message: str
+    steps: Dict[str, float] = field(default_factory=lambda: {s["id"]: 0 for s in ANALYSIS_STEPS})
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    last_updated: Optional[str] = None
+    debug_log: List[Dict[str, Any]] = field(default_factory=list)
+
 # Storage
 analysis_storage: Dict[str, Dict[str, Any]] = {}
-progress_storage: Dict[str, Dict[str, Any]] = {}
+progress_storage: Dict[str, ProgressRecord] = {}
 quality_metrics_storage: Dict[str, Dict[str, Any]] = {}
 fasta_metadata_storage: Dict[str, Dict[str, Any]] = {}
+files_storage: Dict[str, List[Path]] = {}
+# Completed analyses -> the (variant count, quality score, algorithm) counted in STATS
+completed_storage: Dict[str, tuple[int, float, str]] = {}
+
+# Also scan the storage directories for files not tracked in files_storage
+_DELETE_SCAN_FALLBACK = False
+
+# Running aggregates over completed analyses (kept in step with analysis_storage)
+STATS: Dict[str, Any] = {
+    "total_variants": 0,
+    "quality_sum": 0.0,
+    "algorithm_usage": Counter()
+}
+
+# Parts of the /api/statistics payload that are fixed once the app has started
+_STATIC_STATS: Dict[str, Any] = {
+    "expected_variants_per_500bp": "0-2",
+    "actual_false_positive_rate": "<1%",
+    "version": "3.1.0-complete",
+    "filtering": "ultra-strict",
+    "supported_algorithms": ["clinical-grade", "boyer-moore", "kmp", "rabin-karp"],
+    "supported_genes": ["BRCA1", "BRCA2"],
+    "capabilities": {
+        "clinical_detection": CLINICAL_DETECTION_AVAILABLE,
+        "file_upload": FILE_VALIDATOR_AVAILABLE,
+        "report_generation": REPORT_GENERATOR_AVAILABLE,
+        "population_filtering": True,
+        "acmg_classification": True
+    }
+}
+
+# Constant response bodies, serialized once
+_ROOT_OK = orjson.dumps({"message": "Welcome to the SNPify Clinical-Grade Analysis API"})
+_DELETE_OK = orjson.dumps({"message": "Analysis deleted successfully"})
+
+# Serialized /api/statistics payload, rebuilt after the next mutation
+_STATS_CACHE: Optional[bytes] = None
+
+# Bumped on every analysis create/complete/delete; used as the statistics ETag
+# (salted per process so a restart never revalidates a stale client copy)
+MUTATION_VERSION = 0
+_ETAG_SALT = uuid.uuid4().hex[:8]
+
+def _invalidate_stats() -> None:
+    """Drop the cached statistics payload"""
+    global _STATS_CACHE, MUTATION_VERSION
+    _STATS_CACHE = None
+    MUTATION_VERSION += 1
+
+def _record_completion(result: Dict[str, Any], sign: int = 1) -> None:
+    """Add a completed result to completed_storage and STATS (sign=-1 removes it again)"""
+    _invalidate_stats()
+    
+    # completed_storage decides membership, so a result is never counted twice.
+    # Removal subtracts what was recorded, whatever the result's current status.
+    analysis_id = result["id"]
+    if sign > 0:
+        if result.get("status") != "COMPLETED" or analysis_id in completed_storage:
+            return
+        # Every pipeline stores these fields on a completed result
+        metadata = result["metadata"]
+        counted = (len(result["variants"]), metadata["quality_score"], metadata["algorithm_used"])
+        completed_storage[analysis_id] = counted
+    else:
+        counted = completed_storage.pop(analysis_id, None)
+        if counted is None:
+            return
+    
+    variant_count, quality_score, algo = counted
+    STATS["total_variants"] += sign * variant_count
+    STATS["quality_sum"] += sign * quality_score
+    usage = STATS["algorithm_usage"]
+    usage[algo] += sign
+    if usage[algo] <= 0:
+        del usage[algo]
 
 # Ensure storage directory exists
 storage_dir = Path("storage")
@@ -121,27 +303,88 @@ storage_dir.mkdir(exist_ok=True)
 (storage_dir / "results").mkdir(exist_ok=True)
 (storage_dir / "exports").mkdir(exist_ok=True)
 
+# Worker processes for CPU-bound variant calling so the event loop stays responsive.
+# Created on first use (never at import, e.g. in the Mangum handler) and sized by
+# SNPIFY_ANALYSIS_WORKERS; defaults to the CPU count shared across WEB_CONCURRENCY
+# web workers. Where no pool can be built (no /dev/shm on Lambda) analyses run
+# in a thread instead.
+_ANALYSIS_WORKERS = int(os.environ.get("SNPIFY_ANALYSIS_WORKERS", 0)) or max(
+    1, (os.cpu_count() or 1) // max(1, int(os.environ.get("WEB_CONCURRENCY") or 1))
+)
+_ANALYSIS_POOL: Optional[ProcessPoolExecutor] = None
+_ANALYSIS_POOL_UNAVAILABLE = False
+
+def _get_analysis_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the analysis worker pool, creating it on first use (None if processes are unavailable)"""
+    global _ANALYSIS_POOL, _ANALYSIS_POOL_UNAVAILABLE
+    if _ANALYSIS_POOL is None and not _ANALYSIS_POOL_UNAVAILABLE:
+        try:
+            _ANALYSIS_POOL = ProcessPoolExecutor(max_workers=_ANALYSIS_WORKERS)
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"⚠️ Analysis worker pool unavailable ({e}) - running analyses in-process")
+            _ANALYSIS_POOL_UNAVAILABLE = True
+    return _ANALYSIS_POOL
+
+class ClinicalPipelineError(Exception):
+    """Raised when the clinical pipeline itself fails on a sequence"""
+
+@functools.lru_cache(maxsize=2)
+def _get_pipeline(gene: str) -> "ClinicalAnalysisPipeline":
+    """Build the clinical pipeline once per gene (the pipeline keeps no per-analysis state)"""
+    reference_seq = BRCA1_REFERENCE if gene == "BRCA1" else BRCA2_REFERENCE
+    return ClinicalAnalysisPipeline(gene, reference_seq)
+
+def _run_clinical(gene: str, sequence: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the clinical pipeline (executed inside an _ANALYSIS_POOL worker)
+    Pipeline failures are re-raised as ClinicalPipelineError so callers can tell
+    them apart from pool and pickling errors.
+    """
+    try:
+        return _get_pipeline(gene).analyze(sequence, metadata)
+    except Exception as e:
+        raise ClinicalPipelineError(f"{type(e).__name__}: {e}") from None
+
+async def _run_clinical_in_pool(gene: str, sequence: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the clinical pipeline in the worker pool (or a thread when there is no pool)
+    If a worker died (e.g. OOM) the broken pool is discarded so the next analysis
+    gets a fresh one, and BrokenProcessPool propagates so this analysis fails.
+    """
+    global _ANALYSIS_POOL
+    pool = _get_analysis_pool()
+    if pool is None:
+        return await asyncio.to_thread(_run_clinical, gene, sequence, metadata)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, _run_clinical, gene, sequence, metadata)
+    except BrokenProcessPool:
+        logger.error("❌ Analysis worker pool broke - recreating it for the next analysis")
+        if _ANALYSIS_POOL is pool:
+            _ANALYSIS_POOL = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+@app.on_event("shutdown")
+async def shutdown_analysis_pool():
+    """Stop analysis worker processes"""
+    if _ANALYSIS_POOL is not None:
+        _ANALYSIS_POOL.shutdown(wait=False, cancel_futures=True)
+
 async def update_progress(analysis_id: str, step: str, progress: float, message: str):
     """Update analysis progress"""
     try:
-        if analysis_id not in progress_storage:
-            progress_storage[analysis_id] = {
-                "current_step": step,
-                "progress": progress,
-                "message": message,
-                "steps": {s["id"]: 0 for s in ANALYSIS_STEPS},
-                "metrics": {},
-                "last_updated": datetime.now().isoformat(),
-                "debug_log": []
-            }
-        
-        progress_storage[analysis_id]["current_step"] = step
-        progress_storage[analysis_id]["message"] = message
-        progress_storage[analysis_id]["steps"][step] = progress
-        progress_storage[analysis_id]["last_updated"] = datetime.now().isoformat()
-        
-        progress_storage[analysis_id]["debug_log"].append({
-            "timestamp": datetime.now().isoformat(),
+        record = progress_storage.get(analysis_id)
+        if record is None:
+            record = progress_storage[analysis_id] = ProgressRecord(step, progress, message)
+        
+        now = datetime.now().isoformat()
+        record.current_step = step
+        record.message = message
+        record.steps[step] = progress
+        record.last_updated = now
+        
+        record.debug_log.append({
+            "timestamp": now,
             "step": step,
             "progress": progress,
             "message": message
@@ -151,7 +394,7 @@ async def update_progress(analysis_id: str, step: str, progress: float, message:
         total_progress = 0
         for step_info in ANALYSIS_STEPS:
             step_id = step_info["id"]
-            step_progress = progress_storage[analysis_id]["steps"][step_id]
+            step_progress = record.steps[step_id]
             weight = step_info["weight"]
             
             if step_progress >= 100:
@@ -159,15 +402,15 @@ async def update_progress(analysis_id: str, step: str, progress: float, message:
             else:
                 total_progress += (step_progress / 100) * weight
         
-        progress_storage[analysis_id]["progress"] = total_progress
+        record.progress = total_progress
         
         logger.info(f"Progress: {analysis_id} - {step} = {progress}% (overall: {total_progress:.1f}%)")
         
         if step == "report_generation" and progress >= 100:
             for step_info in ANALYSIS_STEPS:
                 if step_info["id"] != "report_generation":
-                    progress_storage[analysis_id]["steps"][step_info["id"]] = 100
-            progress_storage[analysis_id]["progress"] = 100
+                    record.steps[step_info["id"]] = 100
+            record.progress = 100
             logger.info(f"🎉 Analysis {analysis_id} completed - all steps marked as 100%")
 
     except Exception as e:
@@ -228,6 +471,32 @@ def generate_xml_report(result: Dict[str, Any]) -> str:
     
     return "\n".join(xml_lines)
 
+# Bytes read from the start of a saved upload to detect its format
+_FORMAT_SNIFF_BYTES = 4096
+
+def parse_file_sync(file_path: Path, filename: str, target_gene: str) -> tuple[str, Dict[str, Any]]:
+    """Parse a saved upload, streaming FASTA records from disk when the enhanced parser is available"""
+    if FASTA_PARSER_AVAILABLE:
+        with open(file_path, 'rb') as f:
+            head = f.read(_FORMAT_SNIFF_BYTES).decode('utf-8', 'ignore')
+        
+        if detect_file_format(head, filename) == 'FASTA':
+            try:
+                sequence, metadata = parse_fasta_file(file_path, target_gene)
+                logger.info(f"✅ FASTA streamed: {metadata.get('gene', 'Unknown')} gene, {len(sequence)} bp")
+                return sequence, {
+                    'format': 'FASTA',
+                    'parser': 'enhanced',
+                    **metadata
+                }
+            except Exception as e:
+                logger.error(f"❌ Enhanced FASTA parsing failed: {e}")
+                # Fallback to basic parsing
+                content = Path(file_path).read_text(encoding='utf-8')
+                return parse_fasta_basic(content), {'format': 'FASTA', 'parser': 'basic'}
+    
+    return parse_file_content_sync(Path(file_path).read_text(encoding='utf-8'), filename, target_gene)
+
 def parse_file_content_sync(content: str, filename: str, target_gene: str) -> tuple[str, Dict[str, Any]]:
     """FIXED: Synchronous file parsing to avoid async issues"""
     
@@ -258,7 +527,7 @@ def parse_file_content_sync(content: str, filename: str, target_gene: str) -> tu
             return parse_fastq_basic(content), {'format': 'FASTQ', 'parser': 'basic'}
         
         elif file_format == 'RAW_SEQUENCE':
-            sequence = ''.join(c for c in content.upper() if c in 'ATGCNRYSWKMBDHV')
+            sequence = content.translate(_CLEAN_TRANS_UPPER)
             if len(sequence) < 10:
                 raise ValueError("Raw sequence too short (< 10 bases)")
             
@@ -308,16 +577,16 @@ async def perform_clinical_analysis_from_sequence(
         # Step 4: Quality Check (if not already done)
         if start_from_step <= 3:
             await update_progress(analysis_id, "quality_check", 20, "Checking sequence quality...")
-            await asyncio.sleep(0.2)
         
         # Clean sequence
-        cleaned_sequence = sequence.upper().replace(" ", "").replace("\n", "")
+        cleaned_sequence = sequence.translate(_WS_DELETE_UPPER)
         
         # Quality metrics
+        seq_length, gc_count, n_count = _seq_stats(cleaned_sequence)
         quality_metrics = {
-            "sequence_length": len(cleaned_sequence),
-            "gc_content": (cleaned_sequence.count('G') + cleaned_sequence.count('C')) / len(cleaned_sequence),
-            "n_content": cleaned_sequence.count('N') / len(cleaned_sequence),
+            "sequence_length": seq_length,
+            "gc_content": gc_count / seq_length,
+            "n_content": n_count / seq_length,
             "valid": True
         }
         
@@ -326,7 +595,6 @@ async def perform_clinical_analysis_from_sequence(
         
         # Step 5: Preprocessing
         await update_progress(analysis_id, "sequence_preprocessing", 50, "Preprocessing sequence...")
-        await asyncio.sleep(0.3)
         
         # Remove any ambiguous bases
         preprocessed_sequence = cleaned_sequence.replace('N', 'A')  # Conservative replacement
@@ -335,15 +603,11 @@ async def perform_clinical_analysis_from_sequence(
         
         # Step 6: Variant Calling
         await update_progress(analysis_id, "variant_calling", 20, "Starting ultra-strict variant calling...")
-        await asyncio.sleep(0.5)
         
-        reference_seq = BRCA1_REFERENCE if gene == "BRCA1" else BRCA2_REFERENCE
-
         if CLINICAL_DETECTION_AVAILABLE:
             logger.info("✅ Using clinical-grade pipeline")
             # Use the clinical pipeline
-            clinical_pipeline = ClinicalAnalysisPipeline(gene, reference_seq)
-            analysis_result = clinical_pipeline.analyze(preprocessed_sequence, metadata)
+            analysis_result = await _run_clinical_in_pool(gene, preprocessed_sequence, metadata)
             
             variants = analysis_result['variants']
             quality_score = analysis_result['quality_score']
@@ -363,42 +627,31 @@ async def perform_clinical_analysis_from_sequence(
         await update_progress(analysis_id, "variant_calling", 100, f"Found {len(variants)} high-confidence variants")
         
         # Step 7: Quality Filtering
-        await update_progress(analysis_id, "quality_filtering", 50, "Applying quality filters...")
-        await asyncio.sleep(0.3)
-        
         filtered_variants = variants
         
         await update_progress(analysis_id, "quality_filtering", 100, "Quality filtering completed")
         
         # Step 8: Clinical Annotation
-        await update_progress(analysis_id, "clinical_annotation", 50, "Adding clinical annotations...")
-        await asyncio.sleep(0.3)
-        
-        # Ensure all variants have required fields
+        # Ensure all variants have required fields (one shared timestamp per analysis)
+        annotated_at = datetime.now()
         for variant in filtered_variants:
-            if 'clinical_significance' not in variant:
-                variant['clinical_significance'] = 'UNCERTAIN_SIGNIFICANCE'
-            if 'frequency' not in variant:
-                variant['frequency'] = 0.0001
-            if 'created_at' not in variant:
-                variant['created_at'] = datetime.now()
-            if 'updated_at' not in variant:
-                variant['updated_at'] = datetime.now()
+            variant.setdefault('clinical_significance', 'UNCERTAIN_SIGNIFICANCE')
+            variant.setdefault('frequency', 0.0001)
+            variant.setdefault('created_at', annotated_at)
+            variant.setdefault('updated_at', annotated_at)
         
         await update_progress(analysis_id, "clinical_annotation", 100, "Clinical annotation completed")
         
         # Step 9: Report Generation
-        await update_progress(analysis_id, "report_generation", 50, "Generating report...")
-        await asyncio.sleep(0.2)
-        
         # Generate summary
+        cs_counts = _significance_counts(filtered_variants)
         summary = {
             "total_variants": len(filtered_variants),
-            "pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'PATHOGENIC'),
-            "likely_pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_PATHOGENIC'),
-            "uncertain_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'UNCERTAIN_SIGNIFICANCE'),
-            "likely_benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_BENIGN'),
-            "benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'BENIGN'),
+            "pathogenic_variants": cs_counts.get('PATHOGENIC', 0),
+            "likely_pathogenic_variants": cs_counts.get('LIKELY_PATHOGENIC', 0),
+            "uncertain_variants": cs_counts.get('UNCERTAIN_SIGNIFICANCE', 0),
+            "likely_benign_variants": cs_counts.get('LIKELY_BENIGN', 0),
+            "benign_variants": cs_counts.get('BENIGN', 0),
             "overall_risk": "HIGH" if risk_score >= 7 else "MODERATE" if risk_score >= 4 else "LOW",
             "risk_score": risk_score,
             "recommendations": recommendations
@@ -445,6 +698,7 @@ async def perform_clinical_analysis_from_sequence(
         }
         
         analysis_storage[analysis_id] = result
+        _record_completion(result)
         
         await update_progress(analysis_id, "report_generation", 100, "Analysis completed successfully")
         
@@ -477,16 +731,16 @@ async def perform_clinical_analysis(
         
         # Step 1: Quality Check
         await update_progress(analysis_id, "quality_check", 20, "Checking sequence quality...")
-        await asyncio.sleep(0.2)
         
         # Clean sequence
-        cleaned_sequence = sequence.upper().replace(" ", "").replace("\n", "")
+        cleaned_sequence = sequence.translate(_WS_DELETE_UPPER)
         
         # Quality metrics
+        seq_length, gc_count, n_count = _seq_stats(cleaned_sequence)
         quality_metrics = {
-            "sequence_length": len(cleaned_sequence),
-            "gc_content": (cleaned_sequence.count('G') + cleaned_sequence.count('C')) / len(cleaned_sequence),
-            "n_content": cleaned_sequence.count('N') / len(cleaned_sequence),
+            "sequence_length": seq_length,
+            "gc_content": gc_count / seq_length,
+            "n_content": n_count / seq_length,
             "valid": True
         }
         
@@ -494,7 +748,6 @@ async def perform_clinical_analysis(
         
         # Step 2: Preprocessing
         await update_progress(analysis_id, "sequence_preprocessing", 50, "Preprocessing sequence...")
-        await asyncio.sleep(0.3)
         
         # Remove any ambiguous bases
         preprocessed_sequence = cleaned_sequence.replace('N', 'A')  # Conservative replacement
@@ -503,15 +756,13 @@ async def perform_clinical_analysis(
         
         # Step 3: Variant Calling
         await update_progress(analysis_id, "variant_calling", 20, "Starting ultra-strict variant calling...")
-        await asyncio.sleep(0.5)
         
         reference_seq = BRCA1_REFERENCE if gene == "BRCA1" else BRCA2_REFERENCE
 
         if CLINICAL_DETECTION_AVAILABLE:
             logger.info("✅ Using clinical-grade pipeline")
             # Use the FIXED clinical pipeline
-            clinical_pipeline = ClinicalAnalysisPipeline(gene, reference_seq)
-            analysis_result = clinical_pipeline.analyze(preprocessed_sequence, metadata)
+            analysis_result = await _run_clinical_in_pool(gene, preprocessed_sequence, metadata)
             
             variants = analysis_result['variants']
             quality_score = analysis_result['quality_score']
@@ -545,43 +796,32 @@ async def perform_clinical_analysis(
         await update_progress(analysis_id, "variant_calling", 100, f"Found {len(variants)} high-confidence variants")
         
         # Step 4: Quality Filtering
-        await update_progress(analysis_id, "quality_filtering", 50, "Applying quality filters...")
-        await asyncio.sleep(0.3)
-        
         # Already filtered in the clinical algorithm
         filtered_variants = variants
         
         await update_progress(analysis_id, "quality_filtering", 100, "Quality filtering completed")
         
         # Step 5: Clinical Annotation
-        await update_progress(analysis_id, "clinical_annotation", 50, "Adding clinical annotations...")
-        await asyncio.sleep(0.3)
-        
-        # Ensure all variants have required fields
+        # Ensure all variants have required fields (one shared timestamp per analysis)
+        annotated_at = datetime.now()
         for variant in filtered_variants:
-            if 'clinical_significance' not in variant:
-                variant['clinical_significance'] = 'UNCERTAIN_SIGNIFICANCE'
-            if 'frequency' not in variant:
-                variant['frequency'] = 0.0001  # Assume very rare
-            if 'created_at' not in variant:
-                variant['created_at'] = datetime.now()
-            if 'updated_at' not in variant:
-                variant['updated_at'] = datetime.now()
+            variant.setdefault('clinical_significance', 'UNCERTAIN_SIGNIFICANCE')
+            variant.setdefault('frequency', 0.0001)  # Assume very rare
+            variant.setdefault('created_at', annotated_at)
+            variant.setdefault('updated_at', annotated_at)
         
         await update_progress(analysis_id, "clinical_annotation", 100, "Clinical annotation completed")
         
         # Step 6: Report Generation
-        await update_progress(analysis_id, "report_generation", 50, "Generating report...")
-        await asyncio.sleep(0.2)
-        
         # Generate summary
+        cs_counts = _significance_counts(filtered_variants)
         summary = {
             "total_variants": len(filtered_variants),
-            "pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'PATHOGENIC'),
-            "likely_pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_PATHOGENIC'),
-            "uncertain_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'UNCERTAIN_SIGNIFICANCE'),
-            "likely_benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_BENIGN'),
-            "benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'BENIGN'),
+            "pathogenic_variants": cs_counts.get('PATHOGENIC', 0),
+            "likely_pathogenic_variants": cs_counts.get('LIKELY_PATHOGENIC', 0),
+            "uncertain_variants": cs_counts.get('UNCERTAIN_SIGNIFICANCE', 0),
+            "likely_benign_variants": cs_counts.get('LIKELY_BENIGN', 0),
+            "benign_variants": cs_counts.get('BENIGN', 0),
             "overall_risk": "HIGH" if risk_score >= 7 else "MODERATE" if risk_score >= 4 else "LOW",
             "risk_score": risk_score,
             "recommendations": recommendations
@@ -640,6 +880,7 @@ async def perform_clinical_analysis(
         }
         
         analysis_storage[analysis_id] = result
+        _record_completion(result)
         
         await update_progress(analysis_id, "report_generation", 100, "Analysis completed successfully")
         
@@ -651,8 +892,7 @@ async def perform_clinical_analysis(
         logger.info(f"    - Processing time: {processing_time:.2f}s")
         
     except Exception as e:
-        logger.error(f"❌ Analysis {analysis_id} failed: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("❌ Analysis %s failed: %s", analysis_id, e)
         
         error_result = {
             "id": analysis_id,
@@ -683,54 +923,258 @@ async def perform_clinical_analysis(
         analysis_storage[analysis_id] = error_result
         raise
 
+# Upload chunk size when streaming files to disk
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Format lookup by file extension
+_FORMAT_BY_EXTENSION = {
+    '.fasta': 'FASTA',
+    '.fa': 'FASTA',
+    '.fas': 'FASTA',
+    '.fastq': 'FASTQ',
+    '.fq': 'FASTQ'
+}
+
+# Bytes that may not appear in a raw (header-less) sequence
+_RAW_SEQUENCE_VALID = frozenset(b'ATGCNRYSWKMBDHV-\n\r\t ')
+_RAW_SEQUENCE_DELETE = bytes(i for i in range(256) if i not in _RAW_SEQUENCE_VALID)
+
 def detect_file_format(content: str, filename: str) -> str:
     """Detect file format from content and filename"""
     content_start = content.strip()[:500].upper()
-    filename_lower = filename.lower()
+    extension_format = _FORMAT_BY_EXTENSION.get(os.path.splitext(filename.lower())[1])
     
-    if content_start.startswith('>') or filename_lower.endswith(('.fasta', '.fa', '.fas')):
+    if content_start.startswith('>') or extension_format == 'FASTA':
         return 'FASTA'
     
-    if content_start.startswith('@') or filename_lower.endswith(('.fastq', '.fq')):
+    if content_start.startswith('@') or extension_format == 'FASTQ':
         return 'FASTQ'
     
-    if all(c in 'ATGCNRYSWKMBDHV-\n\r\t ' for c in content_start):
+    start_bytes = content_start.encode('utf-8')
+    if len(start_bytes.translate(None, _RAW_SEQUENCE_DELETE)) == len(start_bytes):
         return 'RAW_SEQUENCE'
     
     return 'UNKNOWN'
 
+# bytes.translate tables: ASCII upper-casing, and every byte that is not an
+# IUPAC nucleotide code in either case (deletion runs before the mapping)
+_ASCII_UPPER = bytes.maketrans(string.ascii_lowercase.encode(), string.ascii_uppercase.encode())
+_NON_IUPAC_BYTES = bytes(
+    i for i in range(256) if chr(i) not in VALID_NUCLEOTIDES + VALID_NUCLEOTIDES.lower()
+)
+
 def parse_fasta_basic(content: str) -> str:
     """Basic FASTA parsing fallback"""
     lines = content.strip().split('\n')
-    sequence_lines = []
+    buf = bytearray()
     
     for line in lines:
         line = line.strip()
         if not line.startswith('>') and line:
-            # Clean sequence line
-            cleaned = ''.join(c for c in line.upper() if c in 'ATGCNRYSWKMBDHV')
-            if cleaned:
-                sequence_lines.append(cleaned)
+            # Clean sequence line straight into the buffer
+            buf.extend(line.encode('ascii', 'ignore').translate(_ASCII_UPPER, _NON_IUPAC_BYTES))
     
-    sequence = ''.join(sequence_lines)
-    if len(sequence) < 10:
+    if len(buf) < 10:
         raise ValueError("No valid sequence found in FASTA file")
     
-    return sequence
+    return buf.decode('ascii')
+
+# First FASTQ record at the start of the content: header line, then a sequence line
+# made only of IUPAC codes (anything else is left to the record-by-record scan)
+_FASTQ_RE = re.compile(r'\s*@[^\n]*\n([ACGTNRYSWKMBDHV]*)\r?(?:\n|\Z)', re.A | re.I)
 
 def parse_fastq_basic(content: str) -> str:
     """Basic FASTQ parsing"""
+    match = _FASTQ_RE.match(content)
+    if match and len(match.group(1)) >= 10:
+        return match.group(1).upper()
+    
+    # Fall back to record-by-record scan
     lines = content.strip().split('\n')
     for i in range(0, len(lines), 4):
         if i + 1 < len(lines) and lines[i].startswith('@'):
-            sequence = lines[i + 1].strip().upper()
             # Clean sequence
-            cleaned = ''.join(c for c in sequence if c in 'ATGCNRYSWKMBDHV')
+            cleaned = lines[i + 1].translate(_CLEAN_TRANS_UPPER)
             if len(cleaned) >= 10:
                 return cleaned
     
     raise ValueError("No valid FASTQ sequences found")
 
+def _failed_result(analysis_id: str, error: Exception, algorithm_version: str, start_time: datetime) -> Dict[str, Any]:
+    """Build the stored record for a failed analysis"""
+    return {
+        "id": analysis_id,
+        "status": "FAILED",
+        "variants": [],
+        "summary": {
+            "total_variants": 0,
+            "pathogenic_variants": 0,
+            "likely_pathogenic_variants": 0,
+            "uncertain_variants": 0,
+            "likely_benign_variants": 0,
+            "benign_variants": 0,
+            "overall_risk": "UNKNOWN",
+            "risk_score": 0.0,
+            "recommendations": [f"Analysis failed: {str(error)}"]
+        },
+        "metadata": {
+            "algorithm_version": algorithm_version,
+            "quality_score": 0.0,
+            "error": str(error),
+            "pipeline": "failed",
+            "error_type": type(error).__name__
+        },
+        "progress": 0.0,
+        "start_time": start_time,
+        "error": str(error)
+    }
+
+async def _run_pipeline(
+    analysis_id: str,
+    sequence: str,
+    gene: str,
+    algorithm: str,
+    metadata: Dict[str, Any],
+    start_time: datetime,
+    *,
+    preprocessing_step: str,
+    result_metadata: Dict[str, Any],
+    completion_message: str
+) -> Dict[str, Any]:
+    """Shared preprocessing, variant calling, annotation and report steps.
+
+    `result_metadata` holds the caller-specific metadata fields (input type,
+    pipeline name, version, ...) merged into the stored result.
+    """
+    
+    # Preprocessing
+    await update_progress(analysis_id, preprocessing_step, 20, "Preprocessing sequence...")
+    
+    # Clean sequence and replace N with A (conservative)
+    preprocessed_sequence, gc_count, n_count = _clean_and_count(sequence)
+    
+    logger.info(f"✅ Preprocessed sequence: {len(preprocessed_sequence)} bp")
+    
+    await update_progress(analysis_id, preprocessing_step, 100, "Preprocessing completed")
+    
+    # Quality Check
+    await update_progress(analysis_id, "quality_check", 30, "Assessing sequence quality...")
+    
+    # Quality metrics (counts come from the preprocessing pass)
+    seq_length = len(preprocessed_sequence)
+    quality_metrics = {
+        "sequence_length": seq_length,
+        "gc_content": gc_count / seq_length if seq_length > 0 else 0,
+        "n_content": n_count / seq_length if seq_length > 0 else 0,
+        "valid": seq_length >= 10
+    }
+    
+    await update_progress(analysis_id, "quality_check", 100, "Quality assessment completed")
+    
+    # Variant Calling
+    await update_progress(analysis_id, "variant_calling", 10, "Starting variant calling...")
+    
+    variants = []
+    quality_score = 95.0
+    risk_score = 0.0
+    recommendations = []
+    
+    if CLINICAL_DETECTION_AVAILABLE:
+        logger.info("✅ Using clinical-grade pipeline")
+        
+        await update_progress(analysis_id, "variant_calling", 50, "Running clinical variant calling...")
+        
+        try:
+            analysis_result = await _run_clinical_in_pool(gene, preprocessed_sequence, metadata)
+            
+            variants = analysis_result.get('variants', [])
+            quality_score = analysis_result.get('quality_score', 95.0)
+            risk_score = analysis_result.get('risk_score', 0.0)
+            recommendations = analysis_result.get('recommendations', [])
+            
+            logger.info(f"✅ Clinical analysis found {len(variants)} variants")
+            
+        except ClinicalPipelineError as e:
+            # Only pipeline errors fall back; pool and pickling errors fail the analysis
+            logger.error(f"❌ Clinical analysis failed: {e}")
+            # Use fallback
+            variants = []
+            recommendations = ["Clinical analysis failed - using conservative fallback"]
+    else:
+        logger.warning("⚠️ Clinical detection not available - using fallback")
+        recommendations = ["Using fallback analysis - clinical detection unavailable"]
+    
+    await update_progress(analysis_id, "variant_calling", 100, f"Variant calling completed - found {len(variants)} variants")
+    
+    # Quality Filtering
+    # Variants are already filtered by clinical pipeline
+    filtered_variants = variants
+    
+    await update_progress(analysis_id, "quality_filtering", 100, "Quality filtering completed")
+    
+    # Clinical Annotation
+    # Ensure all variants have required fields (one shared timestamp per analysis)
+    annotated_at = datetime.now()
+    for variant in filtered_variants:
+        variant.setdefault('clinical_significance', 'UNCERTAIN_SIGNIFICANCE')
+        variant.setdefault('frequency', 0.0001)
+        variant.setdefault('created_at', annotated_at)
+        variant.setdefault('updated_at', annotated_at)
+    
+    await update_progress(analysis_id, "clinical_annotation", 100, "Clinical annotation completed")
+    
+    # Report Generation
+    # Generate summary
+    cs_counts = _significance_counts(filtered_variants)
+    summary = {
+        "total_variants": len(filtered_variants),
+        "pathogenic_variants": cs_counts.get('PATHOGENIC', 0),
+        "likely_pathogenic_variants": cs_counts.get('LIKELY_PATHOGENIC', 0),
+        "uncertain_variants": cs_counts.get('UNCERTAIN_SIGNIFICANCE', 0),
+        "likely_benign_variants": cs_counts.get('LIKELY_BENIGN', 0),
+        "benign_variants": cs_counts.get('BENIGN', 0),
+        "overall_risk": "HIGH" if risk_score >= 7 else "MODERATE" if risk_score >= 4 else "LOW",
+        "risk_score": risk_score,
+        "recommendations": recommendations
+    }
+    
+    end_time = datetime.now()
+    processing_time = (end_time - start_time).total_seconds()
+    
+    # Final result
+    result = {
+        "id": analysis_id,
+        "status": "COMPLETED",
+        "variants": filtered_variants,
+        "summary": summary,
+        "metadata": {
+            **result_metadata,
+            "sequence_length": len(preprocessed_sequence),
+            "processing_time": processing_time,
+            "quality_score": quality_score,
+            "coverage": 100.0,
+            "algorithm_used": algorithm,
+            "filtering": "clinical-grade",
+            "quality_metrics": quality_metrics
+        },
+        "progress": 100.0,
+        "start_time": start_time,
+        "end_time": end_time,
+        "error": None
+    }
+    
+    analysis_storage[analysis_id] = result
+    _record_completion(result)
+    
+    await update_progress(analysis_id, "report_generation", 100, completion_message)
+    
+    logger.info(f"    - Variants found: {len(filtered_variants)}")
+    logger.info(f"    - Quality score: {quality_score:.1f}%")
+    logger.info(f"    - Risk score: {risk_score}/10")
+    logger.info(f"    - Processing time: {processing_time:.2f}s")
+    
+    return result
+
 async def perform_unified_analysis(
     analysis_id: str,
     sequence: str,
@@ -752,7 +1196,6 @@ async def perform_unified_analysis(
         
         # Step 1: Initialization
         await update_progress(analysis_id, "initialization", 50, "Initializing analysis...")
-        await asyncio.sleep(0.2)
         
         # Validate inputs
         if not sequence or len(sequence) < 10:
@@ -763,188 +1206,26 @@ async def perform_unified_analysis(
         
         await update_progress(analysis_id, "initialization", 100, "Initialization completed")
         
-        # Step 2: Input Processing  
-        await update_progress(analysis_id, "input_processing", 20, "Processing input sequence...")
-        await asyncio.sleep(0.3)
-        
-        # Clean sequence
-        cleaned_sequence = sequence.upper().replace(" ", "").replace("\n", "").replace("\r", "")
-        cleaned_sequence = ''.join(c for c in cleaned_sequence if c in 'ATGCNRYSWKMBDHV')
-        
-        # Replace N with A (conservative)
-        preprocessed_sequence = cleaned_sequence.replace('N', 'A')
-        
-        logger.info(f"✅ Preprocessed sequence: {len(preprocessed_sequence)} bp")
-        
-        await update_progress(analysis_id, "input_processing", 100, "Input processing completed")
-        
-        # Step 3: Quality Check
-        await update_progress(analysis_id, "quality_check", 30, "Assessing sequence quality...")
-        await asyncio.sleep(0.2)
-        
-        # Quality metrics
-        quality_metrics = {
-            "sequence_length": len(preprocessed_sequence),
-            "gc_content": (preprocessed_sequence.count('G') + preprocessed_sequence.count('C')) / len(preprocessed_sequence),
-            "n_content": cleaned_sequence.count('N') / len(cleaned_sequence) if len(cleaned_sequence) > 0 else 0,
-            "valid": len(preprocessed_sequence) >= 10
-        }
-        
-        await update_progress(analysis_id, "quality_check", 100, "Quality assessment completed")
-        
-        # Step 4: Variant Calling
-        await update_progress(analysis_id, "variant_calling", 10, "Starting variant calling...")
-        await asyncio.sleep(0.5)
-        
-        reference_seq = BRCA1_REFERENCE if gene == "BRCA1" else BRCA2_REFERENCE
-        
-        variants = []
-        quality_score = 95.0
-        risk_score = 0.0
-        recommendations = []
-        
-        if CLINICAL_DETECTION_AVAILABLE:
-            logger.info("✅ Using clinical-grade pipeline")
-            
-            await update_progress(analysis_id, "variant_calling", 50, "Running clinical variant calling...")
-            
-            try:
-                clinical_pipeline = ClinicalAnalysisPipeline(gene, reference_seq)
-                analysis_result = clinical_pipeline.analyze(preprocessed_sequence, metadata)
-                
-                variants = analysis_result.get('variants', [])
-                quality_score = analysis_result.get('quality_score', 95.0)
-                risk_score = analysis_result.get('risk_score', 0.0)
-                recommendations = analysis_result.get('recommendations', [])
-                
-                logger.info(f"✅ Clinical analysis found {len(variants)} variants")
-                
-            except Exception as e:
-                logger.error(f"❌ Clinical analysis failed: {e}")
-                # Use fallback
-                variants = []
-                recommendations = ["Clinical analysis failed - using conservative fallback"]
-        else:
-            logger.warning("⚠️ Clinical detection not available - using fallback")
-            recommendations = ["Using fallback analysis - clinical detection unavailable"]
-        
-        await update_progress(analysis_id, "variant_calling", 100, f"Variant calling completed - found {len(variants)} variants")
-        
-        # Step 5: Quality Filtering
-        await update_progress(analysis_id, "quality_filtering", 50, "Applying quality filters...")
-        await asyncio.sleep(0.2)
-        
-        # Variants are already filtered by clinical pipeline
-        filtered_variants = variants
-        
-        await update_progress(analysis_id, "quality_filtering", 100, "Quality filtering completed")
-        
-        # Step 6: Clinical Annotation
-        await update_progress(analysis_id, "clinical_annotation", 50, "Adding clinical annotations...")
-        await asyncio.sleep(0.2)
-        
-        # Ensure all variants have required fields
-        for variant in filtered_variants:
-            if 'clinical_significance' not in variant:
-                variant['clinical_significance'] = 'UNCERTAIN_SIGNIFICANCE'
-            if 'frequency' not in variant:
-                variant['frequency'] = 0.0001
-            if 'created_at' not in variant:
-                variant['created_at'] = datetime.now()
-            if 'updated_at' not in variant:
-                variant['updated_at'] = datetime.now()
-        
-        await update_progress(analysis_id, "clinical_annotation", 100, "Clinical annotation completed")
-        
-        # Step 7: Report Generation
-        await update_progress(analysis_id, "report_generation", 50, "Generating final report...")
-        await asyncio.sleep(0.2)
-        
-        # Generate summary
-        summary = {
-            "total_variants": len(filtered_variants),
-            "pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'PATHOGENIC'),
-            "likely_pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_PATHOGENIC'),
-            "uncertain_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'UNCERTAIN_SIGNIFICANCE'),
-            "likely_benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_BENIGN'),
-            "benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'BENIGN'),
-            "overall_risk": "HIGH" if risk_score >= 7 else "MODERATE" if risk_score >= 4 else "LOW",
-            "risk_score": risk_score,
-            "recommendations": recommendations
-        }
-        
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
-        
-        # Final result
-        result = {
-            "id": analysis_id,
-            "status": "COMPLETED",
-            "variants": filtered_variants,
-            "summary": summary,
-            "metadata": {
+        # Steps 2-7: shared pipeline
+        await _run_pipeline(
+            analysis_id, sequence, gene, algorithm, metadata, start_time,
+            preprocessing_step="input_processing",
+            result_metadata={
                 "input_type": "FILE" if is_file_analysis else "RAW_SEQUENCE",
                 "file_name": metadata.get("file_name"),
-                "sequence_length": len(preprocessed_sequence),
-                "processing_time": processing_time,
                 "algorithm_version": "3.2.1-fixed",
-                "quality_score": quality_score,
-                "coverage": 100.0,
                 "pipeline": "unified-clinical",
-                "algorithm_used": algorithm,
-                "filtering": "clinical-grade",
-                "quality_metrics": quality_metrics,
                 "is_file_analysis": is_file_analysis
             },
-            "progress": 100.0,
-            "start_time": start_time,
-            "end_time": end_time,
-            "error": None
-        }
-        
-        analysis_storage[analysis_id] = result
-        
-        await update_progress(analysis_id, "report_generation", 100, "Analysis completed successfully!")
+            completion_message="Analysis completed successfully!"
+        )
         
-        logger.info(f"🎉 Analysis {analysis_id} completed successfully:")
-        logger.info(f"    - Variants found: {len(filtered_variants)}")
-        logger.info(f"    - Quality score: {quality_score:.1f}%")
-        logger.info(f"    - Risk score: {risk_score}/10")
-        logger.info(f"    - Processing time: {processing_time:.2f}s")
+        logger.info(f"🎉 Analysis {analysis_id} completed successfully")
         
     except Exception as e:
-        logger.error(f"❌ Analysis {analysis_id} failed: {str(e)}")
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.exception("❌ Analysis %s failed: %s", analysis_id, e)
         
-        # Create error result
-        error_result = {
-            "id": analysis_id,
-            "status": "FAILED",
-            "variants": [],
-            "summary": {
-                "total_variants": 0,
-                "pathogenic_variants": 0,
-                "likely_pathogenic_variants": 0,
-                "uncertain_variants": 0,
-                "likely_benign_variants": 0,
-                "benign_variants": 0,
-                "overall_risk": "UNKNOWN",
-                "risk_score": 0.0,
-                "recommendations": [f"Analysis failed: {str(e)}"]
-            },
-            "metadata": {
-                "algorithm_version": "3.2.1-fixed",
-                "quality_score": 0.0,
-                "error": str(e),
-                "pipeline": "failed",
-                "error_type": type(e).__name__
-            },
-            "progress": 0.0,
-            "start_time": start_time,
-            "error": str(e)
-        }
-        
-        analysis_storage[analysis_id] = error_result
+        analysis_storage[analysis_id] = _failed_result(analysis_id, e, "3.2.1-fixed", start_time)
         
         # Update progress to show error
         await update_progress(analysis_id, "error", 0, f"Analysis failed: {str(e)}")
@@ -953,7 +1234,7 @@ async def perform_unified_analysis(
 
 async def perform_file_analysis(
     analysis_id: str,
-    file_content: str,
+    file_path: Path,
     file_name: str,
     gene: str,
     algorithm: str,
@@ -967,11 +1248,10 @@ async def perform_file_analysis(
         
         # Step 1: File Processing
         await update_progress(analysis_id, "file_processing", 20, f"Processing {file_name}...")
-        await asyncio.sleep(0.3)
         
-        # Parse file content (synchronous to avoid async issues)
+        # Parse the saved upload in a worker thread
         try:
-            sequence, file_metadata = parse_file_content_sync(file_content, file_name, gene)
+            sequence, file_metadata = await asyncio.to_thread(parse_file_sync, file_path, file_name, gene)
             logger.info(f"✅ File parsed successfully: {len(sequence)} bp")
             
             # Store file metadata
@@ -991,174 +1271,28 @@ async def perform_file_analysis(
             await update_progress(analysis_id, "file_processing", 0, f"File parsing failed: {str(e)}")
             raise ValueError(f"File parsing failed: {str(e)}")
         
-        # Step 2: Sequence Preprocessing
-        await update_progress(analysis_id, "sequence_preprocessing", 50, "Preprocessing sequence...")
-        await asyncio.sleep(0.3)
-        
-        # Clean sequence
-        cleaned_sequence = sequence.upper().replace(" ", "").replace("\n", "").replace("\r", "")
-        cleaned_sequence = ''.join(c for c in cleaned_sequence if c in 'ATGCNRYSWKMBDHV')
-        
-        # Replace N with A (conservative)
-        preprocessed_sequence = cleaned_sequence.replace('N', 'A')
-        
-        logger.info(f"✅ Preprocessed sequence: {len(preprocessed_sequence)} bp")
-        
-        await update_progress(analysis_id, "sequence_preprocessing", 100, "Preprocessing completed")
-        
-        # Step 3: Variant Calling
-        await update_progress(analysis_id, "variant_calling", 10, "Starting variant calling...")
-        await asyncio.sleep(0.5)
-        
-        reference_seq = BRCA1_REFERENCE if gene == "BRCA1" else BRCA2_REFERENCE
-        
-        variants = []
-        quality_score = 95.0
-        risk_score = 0.0
-        recommendations = []
-        
-        if CLINICAL_DETECTION_AVAILABLE:
-            logger.info("✅ Using clinical-grade pipeline")
-            
-            await update_progress(analysis_id, "variant_calling", 50, "Running clinical variant calling...")
-            
-            try:
-                clinical_pipeline = ClinicalAnalysisPipeline(gene, reference_seq)
-                analysis_result = clinical_pipeline.analyze(preprocessed_sequence, enhanced_metadata)
-                
-                variants = analysis_result.get('variants', [])
-                quality_score = analysis_result.get('quality_score', 95.0)
-                risk_score = analysis_result.get('risk_score', 0.0)
-                recommendations = analysis_result.get('recommendations', [])
-                
-                logger.info(f"✅ Clinical analysis found {len(variants)} variants")
-                
-            except Exception as e:
-                logger.error(f"❌ Clinical analysis failed: {e}")
-                # Use fallback
-                variants = []
-                recommendations = ["Clinical analysis failed - using conservative fallback"]
-        else:
-            logger.warning("⚠️ Clinical detection not available - using fallback")
-            recommendations = ["Using fallback analysis - clinical detection unavailable"]
-        
-        await update_progress(analysis_id, "variant_calling", 100, f"Variant calling completed - found {len(variants)} variants")
-        
-        # Step 4: Quality Filtering
-        await update_progress(analysis_id, "quality_filtering", 50, "Applying quality filters...")
-        await asyncio.sleep(0.2)
-        
-        # Variants are already filtered by clinical pipeline
-        filtered_variants = variants
-        
-        await update_progress(analysis_id, "quality_filtering", 100, "Quality filtering completed")
-        
-        # Step 5: Clinical Annotation
-        await update_progress(analysis_id, "clinical_annotation", 50, "Adding clinical annotations...")
-        await asyncio.sleep(0.2)
-        
-        # Ensure all variants have required fields
-        for variant in filtered_variants:
-            if 'clinical_significance' not in variant:
-                variant['clinical_significance'] = 'UNCERTAIN_SIGNIFICANCE'
-            if 'frequency' not in variant:
-                variant['frequency'] = 0.0001
-            if 'created_at' not in variant:
-                variant['created_at'] = datetime.now()
-            if 'updated_at' not in variant:
-                variant['updated_at'] = datetime.now()
-        
-        await update_progress(analysis_id, "clinical_annotation", 100, "Clinical annotation completed")
-        
-        # Step 6: Report Generation
-        await update_progress(analysis_id, "report_generation", 50, "Generating final report...")
-        await asyncio.sleep(0.2)
-        
-        # Generate summary
-        summary = {
-            "total_variants": len(filtered_variants),
-            "pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'PATHOGENIC'),
-            "likely_pathogenic_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_PATHOGENIC'),
-            "uncertain_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'UNCERTAIN_SIGNIFICANCE'),
-            "likely_benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'LIKELY_BENIGN'),
-            "benign_variants": sum(1 for v in filtered_variants if v.get('clinical_significance') == 'BENIGN'),
-            "overall_risk": "HIGH" if risk_score >= 7 else "MODERATE" if risk_score >= 4 else "LOW",
-            "risk_score": risk_score,
-            "recommendations": recommendations
-        }
-        
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
-        
-        # Final result
-        result = {
-            "id": analysis_id,
-            "status": "COMPLETED",
-            "variants": filtered_variants,
-            "summary": summary,
-            "metadata": {
+        # Steps 2-6: shared pipeline
+        await _run_pipeline(
+            analysis_id, sequence, gene, algorithm, enhanced_metadata, start_time,
+            preprocessing_step="sequence_preprocessing",
+            result_metadata={
                 "input_type": file_metadata.get('format', 'FILE'),
                 "file_name": file_name,
-                "sequence_length": len(preprocessed_sequence),
-                "processing_time": processing_time,
                 "algorithm_version": "3.2.2-fixed",
-                "quality_score": quality_score,
-                "coverage": 100.0,
                 "pipeline": "file-analysis-fixed",
-                "algorithm_used": algorithm,
-                "filtering": "clinical-grade",
                 "file_metadata": file_metadata
             },
-            "progress": 100.0,
-            "start_time": start_time,
-            "end_time": end_time,
-            "error": None
-        }
-        
-        analysis_storage[analysis_id] = result
-        
-        await update_progress(analysis_id, "report_generation", 100, "File analysis completed successfully!")
+            completion_message="File analysis completed successfully!"
+        )
         
         logger.info(f"🎉 File analysis {analysis_id} completed successfully:")
         logger.info(f"    - File: {file_name}")
         logger.info(f"    - Format: {file_metadata.get('format', 'Unknown')}")
-        logger.info(f"    - Variants found: {len(filtered_variants)}")
-        logger.info(f"    - Quality score: {quality_score:.1f}%")
-        logger.info(f"    - Processing time: {processing_time:.2f}s")
         
     except Exception as e:
-        logger.error(f"❌ File analysis {analysis_id} failed: {str(e)}")
-        logger.error(f"Full traceback: {traceback.format_exc()}")
-        
-        # Create error result
-        error_result = {
-            "id": analysis_id,
-            "status": "FAILED",
-            "variants": [],
-            "summary": {
-                "total_variants": 0,
-                "pathogenic_variants": 0,
-                "likely_pathogenic_variants": 0,
-                "uncertain_variants": 0,
-                "likely_benign_variants": 0,
-                "benign_variants": 0,
-                "overall_risk": "UNKNOWN",
-                "risk_score": 0.0,
-                "recommendations": [f"Analysis failed: {str(e)}"]
-            },
-            "metadata": {
-                "algorithm_version": "3.2.2-fixed",
-                "quality_score": 0.0,
-                "error": str(e),
-                "pipeline": "failed",
-                "error_type": type(e).__name__
-            },
-            "progress": 0.0,
-            "start_time": start_time,
-            "error": str(e)
-        }
+        logger.exception("❌ File analysis %s failed: %s", analysis_id, e)
         
-        analysis_storage[analysis_id] = error_result
+        analysis_storage[analysis_id] = _failed_result(analysis_id, e, "3.2.2-fixed", start_time)
         
         # Update progress to show error
         await update_progress(analysis_id, "file_processing", 0, f"Analysis failed: {str(e)}")
@@ -1169,7 +1303,7 @@ async def perform_file_analysis(
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {"message": "Welcome to the SNPify Clinical-Grade Analysis API"}
+    return Response(_ROOT_OK, media_type="application/json")
 
 @app.get("/api/health")
 async def health_check():
@@ -1212,6 +1346,7 @@ async def analyze_sequence(
     analysis_id = f"SNP_CLINICAL_{int(time.time() * 1000)}_{str(uuid.uuid4())[:8]}"
     
     # Initialize analysis record
+    _invalidate_stats()
     analysis_storage[analysis_id] = {
         "id": analysis_id,
         "status": "PROCESSING",
@@ -1309,20 +1444,25 @@ async def analyze_file(
     analysis_id = f"SNP_FILE_{int(time.time() * 1000)}_{str(uuid.uuid4())[:8]}"
     
     try:
-        # Read file content
-        content = await file.read()
-        file_content = content.decode('utf-8')
+        # Stream the upload to disk chunk by chunk (parsing happens in the background task)
+        file_path = storage_dir / "uploads" / f"{analysis_id}_{file.filename}"
+        file_size = 0
+        has_content = False
+        async with aiofiles.open(file_path, 'wb') as f:
+            while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                has_content = has_content or bool(chunk.strip())
+                await f.write(chunk)
         
         # Basic file validation
-        if len(file_content.strip()) == 0:
+        if not has_content:
+            file_path.unlink(missing_ok=True)
             raise HTTPException(status_code=400, detail="File is empty")
         
-        # Save file
-        file_path = storage_dir / "uploads" / f"{analysis_id}_{file.filename}"
-        with open(file_path, 'w') as f:
-            f.write(file_content)
+        files_storage.setdefault(analysis_id, []).append(file_path)
         
         # Initialize analysis record
+        _invalidate_stats()
         analysis_storage[analysis_id] = {
             "id": analysis_id,
             "status": "PROCESSING",
@@ -1332,7 +1472,7 @@ async def analyze_file(
                 "algorithm_version": "3.2.0-enhanced",
                 "pipeline": "clinical-grade-enhanced-fasta",
                 "file_name": file.filename,
-                "file_size": len(content)
+                "file_size": file_size
             },
             "progress": 0.0,
             "start_time": datetime.now()
@@ -1342,11 +1482,11 @@ async def analyze_file(
         background_tasks.add_task(
             perform_file_analysis,
             analysis_id,
-            file_content,
+            file_path,
             file.filename,
             gene,
             algorithm,
-            {"file_size": len(content)}
+            {"file_size": file_size}
         )
         
         logger.info(f"📄 Started file analysis {analysis_id} for {file.filename}")
@@ -1358,7 +1498,7 @@ async def analyze_file(
             "estimated_time": "15-30 seconds",
             "file_info": {
                 "filename": file.filename,
-                "size": len(content),
+                "size": file_size,
                 "content_type": file.content_type
             },
             "pipeline": "file-analysis-fixed"
@@ -1380,14 +1520,14 @@ async def get_analysis_result(analysis_id: str):
     if analysis_id in quality_metrics_storage:
         result["quality_metrics"] = quality_metrics_storage[analysis_id]
     
-    return result
+    return ORJSONResponse(result)
 
 @app.get("/api/analysis/{analysis_id}/progress")
 async def get_analysis_progress(analysis_id: str):
     """Get analysis progress"""
     if analysis_id not in progress_storage:
         logger.warning(f"⚠️ No progress found for {analysis_id}, returning default")
-        return {
+        return ORJSONResponse({
             "analysis_id": analysis_id,
             "progress": 0,
             "current_step": "initializing",
@@ -1398,126 +1538,192 @@ async def get_analysis_progress(analysis_id: str):
                 "found_in_storage": False,
                 "available_analyses": list(progress_storage.keys())
             }
-        }
+        })
     
     progress = progress_storage[analysis_id]
-    return {
+    return ORJSONResponse({
         "analysis_id": analysis_id,
-        "progress": progress["progress"],
-        "current_step": progress["current_step"],
-        "message": progress["message"],
+        "progress": progress.progress,
+        "current_step": progress.current_step,
+        "message": progress.message,
         "steps": [{"id": s["id"], "name": s["name"], 
-                    "progress": progress["steps"][s["id"]], "weight": s["weight"]} 
+                    "progress": progress.steps[s["id"]], "weight": s["weight"]} 
                         for s in ANALYSIS_STEPS],
-        "metrics": progress.get("metrics", {}),
-        "last_updated": progress.get("last_updated"),
+        "metrics": progress.metrics,
+        "last_updated": progress.last_updated,
         "debug_info": {
             "found_in_storage": True,
-            "total_updates": len(progress.get("debug_log", [])),
-            "last_3_updates": progress.get("debug_log", [])[-3:] if progress.get("debug_log") else []
+            "total_updates": len(progress.debug_log),
+            "last_3_updates": progress.debug_log[-3:]
         }
-    }
+    })
+
+@app.get("/api/analysis/{analysis_id}/export/pdf", response_class=FileResponse)
+async def export_analysis_pdf(analysis_id: str):
+    """Export analysis results as a PDF report"""
+    if not REPORT_GENERATOR_AVAILABLE:
+        raise HTTPException(status_code=501, detail="PDF export is not available")
+    
+    if analysis_id not in analysis_storage:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    result = analysis_storage[analysis_id]
+    
+    pdf_path = storage_dir / "exports" / f"{analysis_id}.pdf"
+    
+    # Completed results never change, so a rendered PDF can be served as-is
+    if result.get("status") == "COMPLETED":
+        try:
+            pdf_stat = await asyncio.to_thread(os.stat, pdf_path)
+        except FileNotFoundError:
+            pdf_stat = None
+        if pdf_stat is not None:
+            return FileResponse(
+                path=pdf_path,
+                filename=f"SNP_Analysis_{analysis_id}.pdf",
+                media_type="application/pdf",
+                stat_result=pdf_stat
+            )
+    
+    try:
+        generator = ReportGenerator()
+        # Render off the event loop
+        pdf_content = await asyncio.to_thread(generator.generate_pdf_report, result)
+        
+        filename = f"SNP_Analysis_{analysis_id}.pdf"
+        
+        # Only completed results are cached; anything else may still change
+        if result.get("status") != "COMPLETED":
+            return Response(
+                pdf_content,
+                media_type="application/pdf",
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            )
+        
+        # Save PDF (write to a per-request temp file and publish atomically)
+        tmp_path = pdf_path.with_name(f"{pdf_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(pdf_content)
+            await asyncio.to_thread(os.replace, tmp_path, pdf_path)
+        except BaseException:
+            await asyncio.to_thread(_safe_unlink, tmp_path)
+            raise
+        
+        tracked_files = files_storage.setdefault(analysis_id, [])
+        if pdf_path not in tracked_files:
+            tracked_files.append(pdf_path)
+        
+        return FileResponse(
+            path=pdf_path,
+            filename=filename,
+            media_type="application/pdf",
+            stat_result=await asyncio.to_thread(os.stat, pdf_path)
+        )
+    except Exception as e:
+        logger.error(f"PDF generation failed: {e}")
+        raise HTTPException(status_code=500, detail="PDF generation failed")
 
 @app.get("/api/analysis/{analysis_id}/export/{format}")
-async def export_analysis(analysis_id: str, format: str):
+async def export_analysis(analysis_id: str, format: ExportFormat):
     """Export analysis results in various formats"""
     if analysis_id not in analysis_storage:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
     result = analysis_storage[analysis_id]
     
-    if format == "json":
-        return JSONResponse(content=result)
+    if format is ExportFormat.json:
+        return ORJSONResponse(content=result)
     
-    elif format == "csv":
+    elif format is ExportFormat.csv:
         csv_content = generate_csv_report(result)
         return JSONResponse(
             content={"data": csv_content},
             headers={"Content-Type": "text/csv"}
         )
     
-    elif format == "xml":
+    elif format is ExportFormat.xml:
         xml_content = generate_xml_report(result)
-        return JSONResponse(
-            content={"data": xml_content},
-            headers={"Content-Type": "application/xml"}
+        return Response(
+            content=xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content,
+            media_type="application/xml"
         )
-    
-    elif format == "pdf" and REPORT_GENERATOR_AVAILABLE:
-        try:
-            generator = ReportGenerator()
-            pdf_content = generator.generate_pdf_report(result)
-            
-            # Save PDF
-            pdf_path = storage_dir / "exports" / f"{analysis_id}.pdf"
-            with open(pdf_path, 'wb') as f:
-                f.write(pdf_content)
-            
-            return FileResponse(
-                path=pdf_path,
-                filename=f"SNP_Analysis_{analysis_id}.pdf",
-                media_type="application/pdf"
-            )
-        except Exception as e:
-            logger.error(f"PDF generation failed: {e}")
-            raise HTTPException(status_code=500, detail="PDF generation failed")
-    
-    else:
-        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
 
-@app.get("/api/statistics")
-async def get_platform_statistics():
+@app.get("/api/statistics", responses={
+    200: {"content": {"application/json": {"example": {
+        "total_analyses": 12,
+        "completed_analyses": 10,
+        "success_rate": 83.3,
+        "average_variants_per_analysis": 1.2,
+        "average_quality_score": 95.0,
+        "algorithm_usage": {"clinical-grade": 10}
+    }}}},
+    304: {"description": "Statistics unchanged since the ETag sent in If-None-Match"}
+})
+async def get_platform_statistics(request: Request):
     """Get platform statistics"""
-    total_analyses = len(analysis_storage)
-    completed_analyses = sum(1 for r in analysis_storage.values() if r.get("status") == "COMPLETED")
+    global _STATS_CACHE
+    etag = f'W/"{_ETAG_SALT}-{MUTATION_VERSION}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
     
-    # Calculate average variants per analysis
-    total_variants = sum(len(r.get("variants", [])) for r in analysis_storage.values() if r.get("status") == "COMPLETED")
-    avg_variants = total_variants / completed_analyses if completed_analyses > 0 else 0
+    if _STATS_CACHE is not None:
+        return Response(_STATS_CACHE, media_type="application/json", headers=cache_headers)
     
-    # Quality scores
-    quality_scores = [r.get("metadata", {}).get("quality_score", 0) 
-                        for r in analysis_storage.values() 
-                        if r.get("status") == "COMPLETED"]
-    avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-    
-    # Algorithm usage
-    algorithm_usage = {}
-    for r in analysis_storage.values():
-        if r.get("status") == "COMPLETED":
-            algo = r.get("metadata", {}).get("algorithm_used", "unknown")
-            algorithm_usage[algo] = algorithm_usage.get(algo, 0) + 1
+    total_analyses = len(analysis_storage)
+    completed_analyses = len(completed_storage)
+    avg_variants = STATS["total_variants"] / completed_analyses if completed_analyses > 0 else 0
+    avg_quality = STATS["quality_sum"] / completed_analyses if completed_analyses > 0 else 0
+    algorithm_usage = dict(STATS["algorithm_usage"])
     
-    return {
+    payload = {
         "total_analyses": total_analyses,
         "completed_analyses": completed_analyses,
         "success_rate": (completed_analyses / total_analyses * 100) if total_analyses > 0 else 0,
         "average_variants_per_analysis": round(avg_variants, 2),
         "average_quality_score": round(avg_quality, 1),
-        "expected_variants_per_500bp": "0-2",
-        "actual_false_positive_rate": "<1%",
         "algorithm_usage": algorithm_usage,
-        "version": "3.1.0-complete",
-        "filtering": "ultra-strict",
-        "supported_algorithms": ["clinical-grade", "boyer-moore", "kmp", "rabin-karp"],
-        "supported_genes": ["BRCA1", "BRCA2"],
-        "capabilities": {
-            "clinical_detection": CLINICAL_DETECTION_AVAILABLE,
-            "file_upload": FILE_VALIDATOR_AVAILABLE,
-            "report_generation": REPORT_GENERATOR_AVAILABLE,
-            "population_filtering": True,
-            "acmg_classification": True
-        }
+        **_STATIC_STATS
     }
+    
+    _STATS_CACHE = orjson.dumps(payload)
+    return Response(_STATS_CACHE, media_type="application/json", headers=cache_headers)
 
-@app.delete("/api/analysis/{analysis_id}")
+def _safe_unlink(path: Union[str, Path]) -> None:
+    """Delete a file, logging instead of raising on failure"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to delete file {path}: {e}")
+
+def _scan_analysis_files(analysis_id: str) -> List[str]:
+    """List upload/export files whose name starts with the analysis id"""
+    paths = []
+    for dir_name in ("uploads", "exports"):
+        with os.scandir(storage_dir / dir_name) as entries:
+            paths.extend(entry.path for entry in entries if entry.name.startswith(analysis_id))
+    return paths
+
+async def _cleanup_files(analysis_id: str, file_paths: List[Path]) -> None:
+    """Remove an analysis' files (file system calls run in worker threads)"""
+    paths: List[Union[str, Path]] = list(file_paths)
+    if _DELETE_SCAN_FALLBACK:
+        paths.extend(await asyncio.to_thread(_scan_analysis_files, analysis_id))
+    await asyncio.gather(*(asyncio.to_thread(_safe_unlink, path) for path in paths))
+
+@app.delete("/api/analysis/{analysis_id}", responses={
+    200: {"content": {"application/json": {"example": {"message": "Analysis deleted successfully"}}}}
+})
 async def delete_analysis(analysis_id: str):
     """Delete analysis result"""
     if analysis_id not in analysis_storage:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
     # Delete from all storages
-    del analysis_storage[analysis_id]
+    _record_completion(analysis_storage.pop(analysis_id), sign=-1)
     
     if analysis_id in progress_storage:
         del progress_storage[analysis_id]
@@ -1525,18 +1731,12 @@ async def delete_analysis(analysis_id: str):
     if analysis_id in quality_metrics_storage:
         del quality_metrics_storage[analysis_id]
     
-    # Delete associated files
-    for dir_name in ["uploads", "exports"]:
-        dir_path = storage_dir / dir_name
-        for file_path in dir_path.glob(f"{analysis_id}*"):
-            try:
-                file_path.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to delete file {file_path}: {e}")
+    # Delete associated files after the response has been sent
+    cleanup = BackgroundTask(_cleanup_files, analysis_id, files_storage.pop(analysis_id, []))
     
     logger.info(f"🗑️ Deleted analysis {analysis_id}")
     
-    return {"message": "Analysis deleted successfully"}
+    return Response(_DELETE_OK, media_type="application/json", background=cleanup)
 
 # @app.post("/api/test/fasta")
 # async def test_fasta_parsing(file: UploadFile = File(...)):
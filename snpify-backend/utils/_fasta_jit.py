@@ -0,0 +1,78 @@
+import re
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not available - using regex-based FASTA record scan")
+
+# Header line: optional leading whitespace, '>' and the rest of the line
+_HEADER_RE = re.compile(rb'^[ \t\r\x0b\x0c]*>([^\n]*)', re.M)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _find_records_kernel(buf):
+        """Scan lines once and return (header_start, header_end, seq_start, seq_end) arrays"""
+        n = buf.shape[0]
+        max_records = 0
+        for k in range(n):
+            if buf[k] == 62:
+                max_records += 1
+
+        hdr_start = np.empty(max_records, dtype=np.int64)
+        hdr_end = np.empty(max_records, dtype=np.int64)
+        seq_start = np.empty(max_records, dtype=np.int64)
+        seq_end = np.empty(max_records, dtype=np.int64)
+        count = 0
+
+        i = 0
+        while i < n:
+            # Skip leading whitespace of the line
+            j = i
+            while j < n and (buf[j] == 32 or buf[j] == 9 or buf[j] == 13 or buf[j] == 11 or buf[j] == 12):
+                j += 1
+
+            # Find the end of the line
+            e = j
+            while e < n and buf[e] != 10:
+                e += 1
+
+            if j < n and buf[j] == 62:
+                if count > 0:
+                    seq_end[count - 1] = i
+                hdr_start[count] = j + 1
+                hdr_end[count] = e
+                seq_start[count] = min(e + 1, n)
+                count += 1
+
+            i = e + 1
+
+        if count > 0:
+            seq_end[count - 1] = n
+
+        return hdr_start[:count], hdr_end[:count], seq_start[:count], seq_end[:count]
+
+def find_records(data: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Locate FASTA records in a byte buffer
+    Returns: (header_start, header_end, seq_start, seq_end) offset arrays;
+    the header slice excludes '>' and the sequence slice spans every line up
+    to the next header.
+    """
+    if NUMBA_AVAILABLE:
+        return _find_records_kernel(np.frombuffer(data, dtype=np.uint8))
+
+    matches = list(_HEADER_RE.finditer(data))
+    hdr_start = np.fromiter((m.start(1) for m in matches), dtype=np.int64, count=len(matches))
+    hdr_end = np.fromiter((m.end(1) for m in matches), dtype=np.int64, count=len(matches))
+    seq_start = np.minimum(hdr_end + 1, len(data))
+    seq_end = np.empty_like(seq_start)
+    if matches:
+        seq_end[:-1] = [m.start() for m in matches[1:]]
+        seq_end[-1] = len(data)
+    return hdr_start, hdr_end, seq_start, seq_end
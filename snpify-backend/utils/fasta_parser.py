@@ -1,28 +1,129 @@
 import re
-from typing import List, Dict, Any, Optional
+import copy
+import string
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterable, Union
 from io import StringIO
 import logging
+import numpy as np
+
+from utils._fasta_jit import find_records
 
 logger = logging.getLogger(__name__)
 
+# Byte codes used to read base/residue counts out of a byte histogram
+_DNA_CODES = np.frombuffer(b'ATGC', dtype=np.uint8)
+_RNA_CODES = np.frombuffer(b'AUGC', dtype=np.uint8)
+_PROTEIN_CODES = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWYXBZJUO', dtype=np.uint8)
+_AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+_AMINO_ACID_CODES = np.frombuffer(_AMINO_ACIDS.encode('ascii'), dtype=np.uint8)
+
+# Sequence type is decided from this many leading residues
+_CLASSIFY_SAMPLE_SIZE = 8192
+
+# bytes.translate tables: upper-case ASCII letters, keep '-', delete everything else
+_SEQUENCE_BYTES_UPPER = bytes.maketrans(string.ascii_lowercase.encode(), string.ascii_uppercase.encode())
+_SEQUENCE_BYTES_DELETE = bytes(
+    b for b in range(256) if chr(b) not in string.ascii_letters and b != ord('-')
+)
+
+# Header patterns, listed in priority order
+_ORGANISMS = ('Homo sapiens', 'Human', 'Mus musculus', 'Mouse')
+_GENES = ('BRCA1', 'BRCA2', 'TP53', 'keratin')
+_ORGANISM_RE = re.compile('|'.join(_ORGANISMS), re.IGNORECASE)
+_GENE_RE = re.compile('|'.join(_GENES), re.IGNORECASE)
+_ACCESSION_RE = re.compile(r'gi\|(\d+)')
+
+# 4-bit nucleotide codes: A, C, G, T, N first, then the remaining IUPAC symbols and gap
+_NIBBLE_ALPHABET = b'ACGTNRYSWKMBDHV-'
+_NIBBLE_DECODE = np.frombuffer(_NIBBLE_ALPHABET, dtype=np.uint8)
+_NIBBLE_ENCODE = np.full(256, 0xFF, dtype=np.uint8)
+_NIBBLE_ENCODE[_NIBBLE_DECODE] = np.arange(len(_NIBBLE_ALPHABET), dtype=np.uint8)
+
+def _first_match(pattern: re.Pattern, names: tuple, text: str) -> Optional[str]:
+    """Return the highest-priority name that `pattern` finds in `text`"""
+    found = {m.lower() for m in pattern.findall(text)}
+    return next((name for name in names if name.lower() in found), None)
+
+def _byte_histogram(sequence: str) -> np.ndarray:
+    """256-bin histogram of the sequence bytes (non-ASCII characters count as '?')"""
+    return np.bincount(np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8), minlength=256)
+
+def _byte_mask(chars) -> np.ndarray:
+    """256-entry boolean mask that is True for the given characters"""
+    mask = np.zeros(256, dtype=bool)
+    mask[[ord(c) for c in chars]] = True
+    return mask
+
+def pack_dna(sequence: str) -> bytes:
+    """Pack an upper-case IUPAC DNA sequence into 4 bits per base (high nibble first)"""
+    codes = _NIBBLE_ENCODE[np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)]
+    if (codes == 0xFF).any():
+        raise ValueError("Sequence contains characters outside the IUPAC DNA alphabet")
+    if len(codes) % 2:
+        codes = np.append(codes, np.uint8(0))
+    return ((codes[0::2] << 4) | codes[1::2]).tobytes()
+
+def unpack_dna(packed: bytes, length: int) -> str:
+    """Inverse of pack_dna; `length` is the original number of bases"""
+    nibbles = np.frombuffer(packed, dtype=np.uint8)
+    codes = np.empty(len(nibbles) * 2, dtype=np.uint8)
+    codes[0::2] = nibbles >> 4
+    codes[1::2] = nibbles & 0x0F
+    return _NIBBLE_DECODE[codes[:length]].tobytes().decode('ascii')
+
 class FASTAParser:
     """ FASTA parser that handles various FASTA formats and edge cases"""
     
     def __init__(self):
         self.valid_dna_bases = set('ATGCNRYSWKMBDHV-')
         self.valid_protein_bases = set('ACDEFGHIKLMNPQRSTVWYXBZJUO*-')
+        self._valid_dna_mask = _byte_mask(self.valid_dna_bases)
+        self._valid_rna_mask = _byte_mask(self.valid_dna_bases - {'T'} | {'U'})
+        self._valid_protein_mask = _byte_mask(self.valid_protein_bases)
+        
+        # str.translate tables used to prepare sequences for SNP analysis
+        self._prep_dna = str.maketrans({'-': None, 'N': 'A'})  # Conservative N replacement
+        self._prep_rna = str.maketrans({'-': None, 'N': 'A', 'U': 'T'})  # Also RNA to DNA
         
     def parse_fasta_content(self, content: str) -> List[Dict[str, Any]]:
         """Parse FASTA content and return structured sequence data"""
         try:
             sequences = []
-            lines = content.strip().split('\n')
+            data = content.encode('utf-8')
             
+            # Record offsets come from a single scan over the bytes
+            for hs, he, ss, se in zip(*(offsets.tolist() for offsets in find_records(data))):
+                header = data[hs:he].decode('utf-8').strip()
+                # Drop spaces, tabs, numbers etc. and upper-case in one pass
+                sequence = data[ss:se].translate(_SEQUENCE_BYTES_UPPER, _SEQUENCE_BYTES_DELETE)
+                
+                if header and sequence:
+                    seq_data = self._create_sequence_record(
+                        header,
+                        sequence.decode('ascii'),
+                        len(sequences) + 1
+                    )
+                    sequences.append(seq_data)
+            
+            logger.info(f"✅ Successfully parsed {len(sequences)} sequences from FASTA")
+            return sequences
+            
+        except Exception as e:
+            logger.error(f"❌ FASTA parsing failed: {str(e)}")
+            raise ValueError(f"FASTA parsing error: {str(e)}")
+    
+    def parse_fasta_stream(self, fp: Iterable[str]) -> List[Dict[str, Any]]:
+        """Parse FASTA records line by line from a text file object (never holds the whole file)"""
+        try:
+            sequences = []
             current_header = ""
-            current_sequence = []
+            current_sequence = bytearray()
             
-            for line_num, line in enumerate(lines):
-                line = line.strip()
+            for raw in fp:
+                line = raw.strip()
                 
                 # Skip empty lines
                 if not line:
@@ -31,33 +132,28 @@ class FASTAParser:
                 if line.startswith('>'):
                     # Save previous sequence if exists
                     if current_header and current_sequence:
-                        seq_data = self._create_sequence_record(
-                            current_header, 
-                            ''.join(current_sequence),
+                        sequences.append(self._create_sequence_record(
+                            current_header,
+                            current_sequence.decode('ascii'),
                             len(sequences) + 1
-                        )
-                        sequences.append(seq_data)
+                        ))
                     
                     # Start new sequence
-                    current_header = line[1:].strip()  # Remove '>' and whitespace
-                    current_sequence = []
-                    
+                    current_header = line[1:].strip()
+                    current_sequence = bytearray()
+                
                 else:
-                    # Add sequence line (remove spaces, tabs, numbers)
-                    cleaned_line = re.sub(r'[^A-Za-z-]', '', line).upper()
-                    if cleaned_line:
-                        current_sequence.append(cleaned_line)
+                    current_sequence += line.encode('utf-8').translate(_SEQUENCE_BYTES_UPPER, _SEQUENCE_BYTES_DELETE)
             
             # Don't forget the last sequence
             if current_header and current_sequence:
-                seq_data = self._create_sequence_record(
-                    current_header, 
-                    ''.join(current_sequence),
+                sequences.append(self._create_sequence_record(
+                    current_header,
+                    current_sequence.decode('ascii'),
                     len(sequences) + 1
-                )
-                sequences.append(seq_data)
+                ))
             
-            logger.info(f"✅ Successfully parsed {len(sequences)} sequences from FASTA")
+            logger.info(f"✅ Successfully parsed {len(sequences)} sequences from FASTA stream")
             return sequences
             
         except Exception as e:
@@ -67,20 +163,22 @@ class FASTAParser:
     def _create_sequence_record(self, header: str, sequence: str, seq_id: int) -> Dict[str, Any]:
         """Create a structured sequence record"""
         
-        # Clean and validate sequence
-        clean_sequence = sequence.replace(' ', '').replace('\t', '').upper()
+        # Sequence lines are already cleaned and upper-cased by parse_fasta_content
+        clean_sequence = sequence
         
         # Extract information from header
         seq_info = self._parse_header(header)
         
-        # Determine sequence type
-        seq_type = self._determine_sequence_type(clean_sequence)
+        # One byte histogram shared by all composition checks
+        hist = _byte_histogram(clean_sequence)
         
-        # Calculate basic statistics
-        stats = self._calculate_sequence_stats(clean_sequence, seq_type)
+        # Determine sequence type from a fixed-size prefix
+        sample = clean_sequence[:_CLASSIFY_SAMPLE_SIZE]
+        sample_hist = hist if len(sample) == len(clean_sequence) else _byte_histogram(sample)
+        seq_type = self._determine_sequence_type(sample, sample_hist)
         
         # Validate sequence
-        is_valid, validation_notes = self._validate_sequence(clean_sequence, seq_type)
+        is_valid, validation_notes = self._validate_sequence(clean_sequence, seq_type, hist)
         
         return {
             'id': f"SEQ_{seq_id:03d}",
@@ -92,10 +190,15 @@ class FASTAParser:
             'organism': seq_info.get('organism', 'Unknown'),
             'gene': seq_info.get('gene', 'Unknown'),
             'accession': seq_info.get('accession', ''),
-            'statistics': stats,
+            'statistics': None,  # Filled in by sequence_statistics() for the selected sequence
             'is_valid': is_valid,
             'validation_notes': validation_notes,
-            'quality_score': self._calculate_quality_score(clean_sequence, is_valid)
+            'quality_score': self._calculate_quality_score(
+                len(clean_sequence),
+                int(hist[ord('N')]),
+                int(hist[ord('G')] + hist[ord('C')]),
+                is_valid
+            )
         }
     
     def _parse_header(self, header: str) -> Dict[str, str]:
@@ -108,48 +211,31 @@ class FASTAParser:
         }
         
         # Try to extract organism
-        organism_patterns = [
-            r'Homo sapiens',
-            r'Human',
-            r'Mus musculus',
-            r'Mouse'
-        ]
-        
-        for pattern in organism_patterns:
-            if re.search(pattern, header, re.IGNORECASE):
-                info['organism'] = pattern.replace(' ', '_')
-                break
+        organism = _first_match(_ORGANISM_RE, _ORGANISMS, header)
+        if organism:
+            info['organism'] = organism.replace(' ', '_')
         
         # Try to extract gene name
-        gene_patterns = [
-            r'BRCA1',
-            r'BRCA2', 
-            r'TP53',
-            r'keratin',
-            r'Keratin'
-        ]
-        
-        for pattern in gene_patterns:
-            if re.search(pattern, header, re.IGNORECASE):
-                info['gene'] = pattern.upper()
-                break
+        gene = _first_match(_GENE_RE, _GENES, header)
+        if gene:
+            info['gene'] = gene.upper()
         
         # Try to extract accession number
-        accession_match = re.search(r'gi\|(\d+)', header)
+        accession_match = _ACCESSION_RE.search(header)
         if accession_match:
             info['accession'] = f"gi|{accession_match.group(1)}"
         
         return info
     
-    def _determine_sequence_type(self, sequence: str) -> str:
+    def _determine_sequence_type(self, sequence: str, hist: np.ndarray) -> str:
         """Determine if sequence is DNA, RNA, or Protein"""
         if not sequence:
             return 'UNKNOWN'
         
-        # Count bases
-        dna_count = sum(1 for base in sequence if base in 'ATGC')
-        rna_count = sum(1 for base in sequence if base in 'AUGC')
-        protein_count = sum(1 for base in sequence if base in 'ACDEFGHIKLMNPQRSTVWYXBZJUO')
+        # Count bases from the byte histogram
+        dna_count = int(hist[_DNA_CODES].sum())
+        rna_count = int(hist[_RNA_CODES].sum())
+        protein_count = int(hist[_PROTEIN_CODES].sum())
         
         total_length = len(sequence)
         
@@ -160,14 +246,23 @@ class FASTAParser:
         # Decision logic
         if dna_percentage >= 0.85:
             return 'DNA'
-        elif 'U' in sequence and rna_count / total_length >= 0.85:
+        elif hist[ord('U')] and rna_count / total_length >= 0.85:
             return 'RNA'
         elif protein_percentage >= 0.60:
             return 'PROTEIN'
         else:
             return 'DNA'  # Default assumption for genetic analysis
     
-    def _calculate_sequence_stats(self, sequence: str, seq_type: str) -> Dict[str, Any]:
+    def sequence_statistics(self, sequence_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return (and cache on the record) full statistics for a parsed sequence"""
+        if sequence_data['statistics'] is None:
+            sequence = sequence_data['sequence']
+            sequence_data['statistics'] = self._calculate_sequence_stats(
+                sequence, sequence_data['type'], _byte_histogram(sequence)
+            )
+        return sequence_data['statistics']
+    
+    def _calculate_sequence_stats(self, sequence: str, seq_type: str, hist: np.ndarray) -> Dict[str, Any]:
         """Calculate sequence statistics"""
         if not sequence:
             return {}
@@ -180,13 +275,13 @@ class FASTAParser:
         if seq_type in ['DNA', 'RNA']:
             # Nucleotide composition
             stats.update({
-                'A_count': sequence.count('A'),
-                'T_count': sequence.count('T') if seq_type == 'DNA' else 0,
-                'U_count': sequence.count('U') if seq_type == 'RNA' else 0,
-                'G_count': sequence.count('G'),
-                'C_count': sequence.count('C'),
-                'N_count': sequence.count('N'),
-                'gap_count': sequence.count('-')
+                'A_count': int(hist[ord('A')]),
+                'T_count': int(hist[ord('T')]) if seq_type == 'DNA' else 0,
+                'U_count': int(hist[ord('U')]) if seq_type == 'RNA' else 0,
+                'G_count': int(hist[ord('G')]),
+                'C_count': int(hist[ord('C')]),
+                'N_count': int(hist[ord('N')]),
+                'gap_count': int(hist[ord('-')])
             })
             
             # GC content
@@ -200,18 +295,17 @@ class FASTAParser:
             
         elif seq_type == 'PROTEIN':
             # Amino acid composition
-            amino_acids = 'ACDEFGHIKLMNPQRSTVWY'
-            for aa in amino_acids:
-                stats[f'{aa}_count'] = sequence.count(aa)
+            for aa, count in zip(_AMINO_ACIDS, hist[_AMINO_ACID_CODES].tolist()):
+                stats[f'{aa}_count'] = count
             
             # Special characters
-            stats['stop_count'] = sequence.count('*')
-            stats['gap_count'] = sequence.count('-')
-            stats['unknown_count'] = sequence.count('X')
+            stats['stop_count'] = int(hist[ord('*')])
+            stats['gap_count'] = int(hist[ord('-')])
+            stats['unknown_count'] = int(hist[ord('X')])
         
         return stats
     
-    def _validate_sequence(self, sequence: str, seq_type: str) -> tuple[bool, List[str]]:
+    def _validate_sequence(self, sequence: str, seq_type: str, hist: np.ndarray) -> tuple[bool, List[str]]:
         """Validate sequence and return status with notes"""
         notes = []
         is_valid = True
@@ -225,28 +319,26 @@ class FASTAParser:
         
         # Type-specific validation
         if seq_type in ['DNA', 'RNA']:
-            valid_bases = self.valid_dna_bases
-            if seq_type == 'RNA':
-                valid_bases = valid_bases - {'T'} | {'U'}
+            valid_mask = self._valid_rna_mask if seq_type == 'RNA' else self._valid_dna_mask
             
-            invalid_chars = set(sequence) - valid_bases
+            invalid_chars = [chr(b) for b in np.nonzero((hist > 0) & ~valid_mask)[0]]
             if invalid_chars:
                 notes.append(f"Invalid characters found: {', '.join(invalid_chars)}")
                 is_valid = False
             
             # Check for too many N's
-            n_percentage = sequence.count('N') / len(sequence) * 100
+            n_percentage = int(hist[ord('N')]) / len(sequence) * 100
             if n_percentage > 20:
                 notes.append(f"High N content: {n_percentage:.1f}%")
             
             # Check for unusual composition
-            gc_count = sequence.count('G') + sequence.count('C')
+            gc_count = int(hist[ord('G')] + hist[ord('C')])
             gc_percentage = gc_count / len(sequence) * 100
             if gc_percentage < 10 or gc_percentage > 90:
                 notes.append(f"Unusual GC content: {gc_percentage:.1f}%")
         
         elif seq_type == 'PROTEIN':
-            invalid_chars = set(sequence) - self.valid_protein_bases
+            invalid_chars = [chr(b) for b in np.nonzero((hist > 0) & ~self._valid_protein_mask)[0]]
             if invalid_chars:
                 notes.append(f"Invalid amino acids: {', '.join(invalid_chars)}")
                 is_valid = False
@@ -256,27 +348,26 @@ class FASTAParser:
         
         return is_valid, notes
     
-    def _calculate_quality_score(self, sequence: str, is_valid: bool) -> float:
-        """Calculate overall quality score for the sequence"""
+    def _calculate_quality_score(self, length: int, n_count: int, gc_count: int, is_valid: bool) -> float:
+        """Calculate overall quality score for the sequence from its composition counts"""
         if not is_valid:
             return 0.0
         
         score = 100.0
         
         # Length penalty
-        if len(sequence) < 50:
+        if length < 50:
             score -= 20
-        elif len(sequence) < 100:
+        elif length < 100:
             score -= 10
         
         # Composition penalties
-        n_percentage = sequence.count('N') / len(sequence) * 100
+        n_percentage = n_count / length * 100
         score -= min(30, n_percentage * 2)  # Penalty for N's
         
         # GC content (for DNA/RNA)
-        if 'G' in sequence or 'C' in sequence:
-            gc_count = sequence.count('G') + sequence.count('C')
-            gc_percentage = gc_count / len(sequence) * 100
+        if gc_count:
+            gc_percentage = gc_count / length * 100
             
             # Optimal GC content is around 40-60%
             if gc_percentage < 20 or gc_percentage > 80:
@@ -297,9 +388,7 @@ class FASTAParser:
             return sequences[0]
         
         # Scoring criteria
-        scored_sequences = []
-        
-        for seq in sequences:
+        def _score(seq: Dict[str, Any]) -> float:
             score = 0
             
             # Quality score (0-100)
@@ -331,13 +420,12 @@ class FASTAParser:
             if 'Homo_sapiens' in seq.get('organism', '') or 'Human' in seq.get('organism', ''):
                 score += 15
             
-            scored_sequences.append((score, seq))
+            return score
         
-        # Sort by score (highest first) and return best
-        scored_sequences.sort(key=lambda x: x[0], reverse=True)
-        best_sequence = scored_sequences[0][1]
+        # Highest score wins (first one on ties)
+        best_sequence = max(sequences, key=_score)
         
-        logger.info(f"✅ Selected sequence: {best_sequence['id']} (score: {scored_sequences[0][0]:.1f})")
+        logger.info(f"✅ Selected sequence: {best_sequence['id']} (score: {_score(best_sequence):.1f})")
         return best_sequence
     
     def prepare_sequence_for_analysis(self, sequence_data: Dict[str, Any]) -> str:
@@ -346,22 +434,84 @@ class FASTAParser:
         sequence = sequence_data['sequence']
         seq_type = sequence_data['type']
         
-        # Clean sequence
-        cleaned = sequence.replace('-', '').replace('N', 'A')  # Conservative replacement
-        
-        # Convert RNA to DNA if needed
-        if seq_type == 'RNA':
-            cleaned = cleaned.replace('U', 'T')
-        
         # For protein sequences, we can't do SNP analysis
         if seq_type == 'PROTEIN':
             raise ValueError("Cannot perform SNP analysis on protein sequences. Please provide DNA sequence.")
         
+        # Clean sequence (and convert RNA to DNA) in one pass
+        cleaned = sequence.translate(self._prep_rna if seq_type == 'RNA' else self._prep_dna)
+        
         logger.info(f"✅ Prepared {len(cleaned)}bp sequence for analysis")
         return cleaned
 
 
-# Integration function for the main API
+def _prepare_best_sequence(parser: FASTAParser, sequences: List[Dict[str, Any]],
+                           target_gene: str = None) -> tuple[str, Dict[str, Any]]:
+    """Select and prepare the best parsed sequence; returns (prepared_sequence, sequence_metadata)"""
+    if not sequences:
+        raise ValueError("No valid sequences found in FASTA file")
+    
+    # Select best sequence
+    best_sequence = parser.select_best_sequence_for_analysis(sequences, target_gene)
+    
+    # Prepare for analysis
+    prepared_sequence = parser.prepare_sequence_for_analysis(best_sequence)
+    
+    # Return prepared sequence and metadata
+    return prepared_sequence, {
+        'original_header': best_sequence['header'],
+        'sequence_id': best_sequence['id'],
+        'organism': best_sequence['organism'],
+        'gene': best_sequence['gene'],
+        'length': best_sequence['length'],
+        'type': best_sequence['type'],
+        'quality_score': best_sequence['quality_score'],
+        'validation_notes': best_sequence['validation_notes'],
+        'statistics': parser.sequence_statistics(best_sequence),
+        'total_sequences_in_file': len(sequences)
+    }
+
+
+# Recently parsed uploads, keyed by (content digest, target gene); re-analysis of
+# the same file skips parsing entirely. Sequences are kept nibble-packed when possible
+# and metadata is stored as a private deep copy.
+_PARSE_CACHE_SIZE = 32
+_PARSE_HASH_CHUNK = 1 << 20
+_parse_cache: "OrderedDict[tuple[bytes, Optional[str]], tuple[Union[str, bytes], int, Dict[str, Any]]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+def _content_digest(chunks: Iterable[str]) -> bytes:
+    """Digest of the UTF-8 encoding of the given text chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk.encode('utf-8'))
+    return digest.digest()
+
+def _cached_parse(key: tuple[bytes, Optional[str]]) -> Optional[tuple[str, Dict[str, Any]]]:
+    """Return a cached (prepared_sequence, sequence_metadata) for key, or None"""
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is None:
+            return None
+        _parse_cache.move_to_end(key)
+    stored, length, metadata = cached
+    sequence = unpack_dna(stored, length) if isinstance(stored, bytes) else stored
+    return sequence, copy.deepcopy(metadata)
+
+def _store_parse(key: tuple[bytes, Optional[str]], prepared_sequence: str, metadata: Dict[str, Any]):
+    """Cache a parse result, packing the sequence when it is plain IUPAC DNA"""
+    try:
+        stored = pack_dna(prepared_sequence)
+    except ValueError:
+        stored = prepared_sequence
+    
+    with _parse_cache_lock:
+        _parse_cache[key] = (stored, len(prepared_sequence), copy.deepcopy(metadata))
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+
+
+# Integration functions for the main API
 def parse_fasta_file_content(content: str, target_gene: str = None) -> tuple[str, Dict[str, Any]]:
     """
     Parse FASTA file and return the best sequence for analysis
@@ -369,34 +519,42 @@ def parse_fasta_file_content(content: str, target_gene: str = None) -> tuple[str
     """
     
     try:
+        key = (_content_digest((content,)), target_gene)
+        cached = _cached_parse(key)
+        if cached is not None:
+            return cached
+        
         parser = FASTAParser()
+        prepared_sequence, metadata = _prepare_best_sequence(parser, parser.parse_fasta_content(content), target_gene)
+        _store_parse(key, prepared_sequence, metadata)
+        return prepared_sequence, metadata
         
-        # Parse all sequences
-        sequences = parser.parse_fasta_content(content)
+    except Exception as e:
+        logger.error(f"❌ FASTA parsing failed: {str(e)}")
+        raise ValueError(f"Failed to parse FASTA file: {str(e)}")
+
+
+def parse_fasta_file(path: str, target_gene: str = None) -> tuple[str, Dict[str, Any]]:
+    """
+    Stream-parse a FASTA file from disk and return the best sequence for analysis
+    Returns: (prepared_sequence, sequence_metadata)
+    """
+    
+    try:
+        # Digest the decoded text in chunks; same key as parse_fasta_file_content(read_text())
+        with open(path, 'r', encoding='utf-8') as fp:
+            key = (_content_digest(iter(lambda: fp.read(_PARSE_HASH_CHUNK), '')), target_gene)
+        cached = _cached_parse(key)
+        if cached is not None:
+            return cached
         
-        if not sequences:
-            raise ValueError("No valid sequences found in FASTA file")
-        
-        # Select best sequence
-        best_sequence = parser.select_best_sequence_for_analysis(sequences, target_gene)
-        
-        # Prepare for analysis
-        prepared_sequence = parser.prepare_sequence_for_analysis(best_sequence)
-        
-        # Return prepared sequence and metadata
-        return prepared_sequence, {
-            'original_header': best_sequence['header'],
-            'sequence_id': best_sequence['id'],
-            'organism': best_sequence['organism'],
-            'gene': best_sequence['gene'],
-            'length': best_sequence['length'],
-            'type': best_sequence['type'],
-            'quality_score': best_sequence['quality_score'],
-            'validation_notes': best_sequence['validation_notes'],
-            'statistics': best_sequence['statistics'],
-            'total_sequences_in_file': len(sequences)
-        }
+        parser = FASTAParser()
+        with open(path, 'r', encoding='utf-8') as fp:
+            sequences = parser.parse_fasta_stream(fp)
+        prepared_sequence, metadata = _prepare_best_sequence(parser, sequences, target_gene)
+        _store_parse(key, prepared_sequence, metadata)
+        return prepared_sequence, metadata
         
     except Exception as e:
         logger.error(f"❌ FASTA parsing failed: {str(e)}")
-        raise ValueError(f"Failed to parse FASTA file: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Failed to parse FASTA file: {str(e)}")
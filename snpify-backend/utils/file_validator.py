@@ -1,20 +1,38 @@
 import os
+import re
+import string
 import mimetypes
 from typing import Optional, Dict, Any
+import numpy as np
 from fastapi import UploadFile
 
+# Upload rules (shared by every FileValidator instance)
+_ALLOWED_EXTENSIONS = frozenset({'.fasta', '.fa', '.fastq', '.fq', '.vcf', '.txt'})
+_ALLOWED_MIME_TYPES = frozenset({
+    'text/plain',
+    'text/x-fasta',
+    'application/octet-stream',
+    'application/text'
+})
+_MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
+# 256-entry lookup table: 1 for valid (upper-case) sequence bytes
+_VALID_LUT = np.zeros(256, dtype=np.uint8)
+_VALID_LUT[np.frombuffer(b'ATGCNRYSWKMBDHV-', dtype=np.uint8)] = 1
+
+_NON_WHITESPACE_RE = re.compile(r'\S')
+
+# bytes.translate table for ASCII upper-casing
+_ASCII_UPPER = bytes.maketrans(string.ascii_lowercase.encode(), string.ascii_uppercase.encode())
+
 class FileValidator:
     """Validator for uploaded files (without python-magic)"""
     
     def __init__(self):
-        self.allowed_extensions = {'.fasta', '.fa', '.fastq', '.fq', '.vcf', '.txt'}
-        self.allowed_mime_types = {
-            'text/plain',
-            'text/x-fasta',
-            'application/octet-stream',
-            'application/text'
-        }
-        self.max_file_size = 10 * 1024 * 1024  # 10MB
+        self.allowed_extensions = _ALLOWED_EXTENSIONS
+        self.allowed_mime_types = _ALLOWED_MIME_TYPES
+        self.max_file_size = _MAX_FILE_SIZE
+        self._valid_lut = _VALID_LUT
     
     def validate_file(self, file: UploadFile) -> Dict[str, Any]:
         """Validate uploaded file"""
@@ -48,18 +66,24 @@ class FileValidator:
             }
         }
     
-    def detect_file_format(self, content: str) -> str:
-        """Detect file format from content (simple heuristics)"""
-        content = content.strip()
+    @staticmethod
+    def detect_file_format(content: str) -> str:
+        """Detect file format from content (simple heuristics, without copying the content)"""
+        first = _NON_WHITESPACE_RE.search(content)
+        head = first.group() if first else ''
         
-        if content.startswith('>'):
+        if head == '>':
             return 'FASTA'
-        elif content.startswith('@'):
+        elif head == '@':
             return 'FASTQ'
-        elif content.startswith('#') or '\t' in content:
+        elif head == '#':
+            return 'VCF'
+        
+        # A tab counts only if non-whitespace text follows it (i.e. not in trailing whitespace)
+        tab = content.find('\t', first.start()) if first else -1
+        if tab != -1 and _NON_WHITESPACE_RE.search(content, tab):
             return 'VCF'
-        else:
-            return 'RAW_SEQUENCE'
+        return 'RAW_SEQUENCE'
     
     def validate_content(self, content: str, filename: str = "") -> Dict[str, Any]:
         """Validate file content"""
@@ -78,19 +102,25 @@ class FileValidator:
             if not content.count('>'):
                 errors.append("Invalid FASTA format: No sequence headers found")
         elif file_format == 'FASTQ':
-            lines = content.split('\n')
-            if len(lines) % 4 != 0:
+            # Same line count as len(content.split('\n')), without building the list
+            line_count = content.count('\n') + 1
+            if line_count % 4 != 0:
                 warnings.append("FASTQ file may be incomplete")
         
-        # Check for valid DNA characters
+        # Check for valid DNA characters (byte LUT over the ASCII range)
         sequence_lines = []
         for line in content.split('\n'):
             if not line.startswith('>') and not line.startswith('@') and not line.startswith('+'):
-                sequence_lines.append(line.strip().upper())
+                sequence_lines.append(line.strip())
         
         sequence_content = ''.join(sequence_lines)
-        valid_chars = set('ATGCNRYSWKMBDHV-')
-        invalid_chars = set(sequence_content) - valid_chars
+        arr = np.frombuffer(sequence_content.encode('ascii', 'ignore').translate(_ASCII_UPPER), dtype=np.uint8)
+        invalid_bytes = np.nonzero(np.bincount(arr, minlength=256) * (1 - self._valid_lut))[0]
+        invalid_chars = [chr(b) for b in invalid_bytes]
+        
+        # Non-ASCII characters are never valid; report them as they appear
+        if not sequence_content.isascii():
+            invalid_chars.extend(sorted({c for c in sequence_content if ord(c) > 127}))
         
         if invalid_chars:
             warnings.append(f"Found potentially invalid characters: {', '.join(invalid_chars)}")
@@ -1,12 +1,21 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Iterable
 import json
+import bisect
+import functools
 import logging
 import random
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of (variant, population) frequencies kept in the lookup cache
+FREQUENCY_CACHE_SIZE = 8192
+
 class PopulationGroup(Enum):
     """Population groups for frequency data"""
     GLOBAL = "global"
@@ -16,7 +25,7 @@ class PopulationGroup(Enum):
     LATINO = "latino"
     ASHKENAZI_JEWISH = "ashkenazi_jewish"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VariantFrequency:
     """Variant frequency data across populations"""
     global_freq: float
@@ -27,16 +36,187 @@ class VariantFrequency:
     ashkenazi_freq: Optional[float] = None
     sample_size: int = 1000
 
+# Variant tables are built once at import and shared by every PopulationFrequencyDB
+
+# BRCA1 common variants (based on gnomAD and clinical databases)
+_BRCA1_COMMON_VARIANTS: Dict[str, VariantFrequency] = {
+    "17:43071077:A:G": VariantFrequency(  # Example: common benign variant
+        global_freq=0.12,
+        european_freq=0.15,
+        african_freq=0.08,
+        asian_freq=0.10,
+        sample_size=152450
+    ),
+    "17:43074330:G:A": VariantFrequency(  # Common synonymous variant
+        global_freq=0.045,
+        european_freq=0.052,
+        african_freq=0.038,
+        asian_freq=0.041,
+        sample_size=145230
+    ),
+    "17:43082434:T:C": VariantFrequency(  # Common intronic variant
+        global_freq=0.089,
+        european_freq=0.095,
+        african_freq=0.074,
+        asian_freq=0.092,
+        sample_size=141890
+    ),
+    "17:43104261:C:T": VariantFrequency(  # Common 3'UTR variant
+        global_freq=0.156,
+        european_freq=0.178,
+        african_freq=0.142,
+        asian_freq=0.134,
+        sample_size=148790
+    )
+}
+
+# BRCA2 common variants
+_BRCA2_COMMON_VARIANTS: Dict[str, VariantFrequency] = {
+    "13:32315508:G:A": VariantFrequency(  # Common synonymous variant
+        global_freq=0.067,
+        european_freq=0.072,
+        african_freq=0.058,
+        asian_freq=0.071,
+        sample_size=149230
+    ),
+    "13:32344653:A:G": VariantFrequency(  # Common intronic variant
+        global_freq=0.124,
+        european_freq=0.138,
+        african_freq=0.098,
+        asian_freq=0.127,
+        sample_size=147560
+    ),
+    "13:32370955:T:C": VariantFrequency(  # Common missense (benign)
+        global_freq=0.034,
+        european_freq=0.041,
+        african_freq=0.022,
+        asian_freq=0.038,
+        sample_size=143890
+    )
+}
+
+# All common variants
+_COMMON_VARIANTS: Dict[str, VariantFrequency] = {**_BRCA1_COMMON_VARIANTS, **_BRCA2_COMMON_VARIANTS}
+
+# Population-specific variants with different frequencies
+_POPULATION_SPECIFIC_VARIANTS: Dict[str, Dict[str, VariantFrequency]] = {
+    'ashkenazi_specific': {
+        # BRCA1 185delAG (Ashkenazi founder mutation)
+        "17:43094077:AG:G": VariantFrequency(
+            global_freq=0.0001,
+            european_freq=0.00005,
+            ashkenazi_freq=0.012,  # ~1.2% in Ashkenazi Jewish population
+            sample_size=45230
+        ),
+        # BRCA1 5382insC (Ashkenazi founder mutation)
+        "17:43071238:C:CA": VariantFrequency(
+            global_freq=0.00008,
+            european_freq=0.00003,
+            ashkenazi_freq=0.011,  # ~1.1% in Ashkenazi Jewish population
+            sample_size=43890
+        ),
+        # BRCA2 6174delT (Ashkenazi founder mutation)
+        "13:32346826:AT:A": VariantFrequency(
+            global_freq=0.00012,
+            european_freq=0.00006,
+            ashkenazi_freq=0.013,  # ~1.3% in Ashkenazi Jewish population
+            sample_size=41750
+        )
+    },
+    'african_specific': {
+        # BRCA2 variant more common in African populations
+        "13:32356508:G:T": VariantFrequency(
+            global_freq=0.002,
+            european_freq=0.0008,
+            african_freq=0.018,   # Higher in African populations
+            asian_freq=0.001,
+            sample_size=38940
+        )
+    },
+    'asian_specific': {
+        # BRCA1 variant more common in Asian populations
+        "17:43076614:C:T": VariantFrequency(
+            global_freq=0.003,
+            european_freq=0.001,
+            african_freq=0.002,
+            asian_freq=0.022,     # Higher in Asian populations
+            sample_size=42180
+        )
+    }
+}
+
+# Every known variant in one dict (common variants take precedence, then
+# population groups in order) so a lookup is a single hash probe
+def _merge_variant_tables() -> Dict[str, VariantFrequency]:
+    merged = dict(_COMMON_VARIANTS)
+    for variants in _POPULATION_SPECIFIC_VARIANTS.values():
+        for variant_key, freq_data in variants.items():
+            merged.setdefault(variant_key, freq_data)
+    return merged
+
+_ALL_VARIANTS = _merge_variant_tables()
+
 class PopulationFrequencyDB:
     """
     Population frequency database for BRCA1/BRCA2 variants
     In production, this would connect to gnomAD, ExAC, or similar databases
     """
     
+    # VariantFrequency field holding each population's frequency
+    _POP_ATTR = {
+        PopulationGroup.GLOBAL: 'global_freq',
+        PopulationGroup.EUROPEAN: 'european_freq',
+        PopulationGroup.AFRICAN: 'african_freq',
+        PopulationGroup.ASIAN: 'asian_freq',
+        PopulationGroup.LATINO: 'latino_freq',
+        PopulationGroup.ASHKENAZI_JEWISH: 'ashkenazi_freq'
+    }
+    _POP_VALUES = tuple(pop.value for pop in PopulationGroup)
+    _POP_COLUMN = {pop: column for column, pop in enumerate(PopulationGroup)}
+    
+    # Known founder mutations: (gene, ref, alt) -> (population, mutation name)
+    _FOUNDER_INDEX = MappingProxyType({
+        # Ashkenazi Jewish founder mutations
+        ('BRCA1', 'AG', 'G'): ('ashkenazi', '185delAG'),
+        ('BRCA1', 'C', 'CA'): ('ashkenazi', '5382insC'),
+        ('BRCA2', 'AT', 'A'): ('ashkenazi', '6174delT'),
+        # Other population founder mutations can be added here
+    })
+    
+    # Base frequency by mutation type, used when a variant is not in the database
+    _MUTATION_TYPE_FREQS = MappingProxyType({
+        # Transitions (more common)
+        "A>G": 0.008,   # Common transition
+        "G>A": 0.007,   # Common transition
+        "C>T": 0.006,   # Common transition (CpG deamination)
+        "T>C": 0.005,   # Common transition
+        # Transversions (less common)
+        "A>T": 0.002,   # Less common
+        "T>A": 0.002,   # Less common
+        "A>C": 0.0015,  # Rare transversion
+        "C>A": 0.0015,  # Rare transversion
+        "G>C": 0.001,   # Rare transversion
+        "C>G": 0.001,   # Rare transversion
+        "G>T": 0.0018,  # Moderately rare
+        "T>G": 0.0018   # Moderately rare
+    })
+    
     def __init__(self):
-        self.frequency_cache = {}
-        self.common_variants = self._load_common_variants()
-        self.population_specific_variants = self._load_population_specific_variants()
+        self.frequency_cache: "OrderedDict[tuple, Optional[float]]" = OrderedDict()  # LRU, bounded
+        self._cache_lock = threading.Lock()  # The module-level POP_DB is shared across threads
+        self.common_variants = _COMMON_VARIANTS
+        self.population_specific_variants = _POPULATION_SPECIFIC_VARIANTS
+        self._all_variants = _ALL_VARIANTS
+        
+        # Column view of the known variants: one row per variant, one column per
+        # PopulationGroup, with missing frequencies already replaced by the global one
+        self._variant_keys = tuple(self._all_variants)
+        self._variant_rows = {variant_key: row for row, variant_key in enumerate(self._variant_keys)}
+        self._frequency_table = np.array(
+            [[self._get_population_frequency(freq_data, pop) for pop in PopulationGroup]
+             for freq_data in self._all_variants.values()],
+            dtype=np.float64
+        ).reshape(len(self._variant_keys), len(PopulationGroup))
         
         # Frequency thresholds for classification
         self.thresholds = {
@@ -46,122 +226,16 @@ class PopulationFrequencyDB:
             'rare': 0.0001,          # 0.01-0.1% frequency
             'very_rare': 0.00001     # <0.01% frequency
         }
-    
-    def _load_common_variants(self) -> Dict[str, VariantFrequency]:
-        """Load known common variants with population frequencies"""
-        
-        # BRCA1 common variants (based on gnomAD and clinical databases)
-        brca1_common = {
-            "17:43071077:A:G": VariantFrequency(  # Example: common benign variant
-                global_freq=0.12,
-                european_freq=0.15,
-                african_freq=0.08,
-                asian_freq=0.10,
-                sample_size=152450
-            ),
-            "17:43074330:G:A": VariantFrequency(  # Common synonymous variant
-                global_freq=0.045,
-                european_freq=0.052,
-                african_freq=0.038,
-                asian_freq=0.041,
-                sample_size=145230
-            ),
-            "17:43082434:T:C": VariantFrequency(  # Common intronic variant
-                global_freq=0.089,
-                european_freq=0.095,
-                african_freq=0.074,
-                asian_freq=0.092,
-                sample_size=141890
-            ),
-            "17:43104261:C:T": VariantFrequency(  # Common 3'UTR variant
-                global_freq=0.156,
-                european_freq=0.178,
-                african_freq=0.142,
-                asian_freq=0.134,
-                sample_size=148790
-            )
-        }
-        
-        # BRCA2 common variants
-        brca2_common = {
-            "13:32315508:G:A": VariantFrequency(  # Common synonymous variant
-                global_freq=0.067,
-                european_freq=0.072,
-                african_freq=0.058,
-                asian_freq=0.071,
-                sample_size=149230
-            ),
-            "13:32344653:A:G": VariantFrequency(  # Common intronic variant
-                global_freq=0.124,
-                european_freq=0.138,
-                african_freq=0.098,
-                asian_freq=0.127,
-                sample_size=147560
-            ),
-            "13:32370955:T:C": VariantFrequency(  # Common missense (benign)
-                global_freq=0.034,
-                european_freq=0.041,
-                african_freq=0.022,
-                asian_freq=0.038,
-                sample_size=143890
-            )
-        }
         
-        # Combine all common variants
-        common_variants = {}
-        common_variants.update(brca1_common)
-        common_variants.update(brca2_common)
+        # Thresholds in ascending order for bisect-based classification
+        ascending = sorted(self.thresholds.items(), key=lambda item: item[1])
+        self._threshold_values = [value for _, value in ascending]
+        self._threshold_labels = [label for label, _ in ascending]
         
-        return common_variants
-    
-    def _load_population_specific_variants(self) -> Dict[str, Dict[str, VariantFrequency]]:
-        """Load population-specific variants with different frequencies"""
-        
-        return {
-            'ashkenazi_specific': {
-                # BRCA1 185delAG (Ashkenazi founder mutation)
-                "17:43094077:AG:G": VariantFrequency(
-                    global_freq=0.0001,
-                    european_freq=0.00005,
-                    ashkenazi_freq=0.012,  # ~1.2% in Ashkenazi Jewish population
-                    sample_size=45230
-                ),
-                # BRCA1 5382insC (Ashkenazi founder mutation)
-                "17:43071238:C:CA": VariantFrequency(
-                    global_freq=0.00008,
-                    european_freq=0.00003,
-                    ashkenazi_freq=0.011,  # ~1.1% in Ashkenazi Jewish population
-                    sample_size=43890
-                ),
-                # BRCA2 6174delT (Ashkenazi founder mutation)
-                "13:32346826:AT:A": VariantFrequency(
-                    global_freq=0.00012,
-                    european_freq=0.00006,
-                    ashkenazi_freq=0.013,  # ~1.3% in Ashkenazi Jewish population
-                    sample_size=41750
-                )
-            },
-            'african_specific': {
-                # BRCA2 variant more common in African populations
-                "13:32356508:G:T": VariantFrequency(
-                    global_freq=0.002,
-                    european_freq=0.0008,
-                    african_freq=0.018,   # Higher in African populations
-                    asian_freq=0.001,
-                    sample_size=38940
-                )
-            },
-            'asian_specific': {
-                # BRCA1 variant more common in Asian populations
-                "17:43076614:C:T": VariantFrequency(
-                    global_freq=0.003,
-                    european_freq=0.001,
-                    african_freq=0.002,
-                    asian_freq=0.022,     # Higher in Asian populations
-                    sample_size=42180
-                )
-            }
-        }
+        # Deterministic helpers are memoized per instance (classification depends
+        # on this instance's thresholds); bulk annotation repeats the same inputs
+        self.classify_variant_by_frequency = functools.lru_cache(maxsize=512)(self.classify_variant_by_frequency)
+        self._estimate_by_mutation_type = functools.lru_cache(maxsize=512)(self._estimate_frequency_by_mutation_type)
     
     def get_frequency(self, ref_allele: str, alt_allele: str, gene: str, 
                      position: Optional[int] = None, 
@@ -180,117 +254,91 @@ class PopulationFrequencyDB:
             Frequency value or None if not found
         """
         
-        # Create variant key
-        chromosome = "17" if gene == "BRCA1" else "13"
-        
-        if position:
-            variant_key = f"{chromosome}:{position}:{ref_allele}:{alt_allele}"
-        else:
-            # Use mutation type for general lookup
-            variant_key = f"{ref_allele}>{alt_allele}"
-        
-        # Check cache first
-        cache_key = f"{variant_key}:{population.value}"
-        if cache_key in self.frequency_cache:
-            return self.frequency_cache[cache_key]
+        # Check cache first (tuple key: no string formatting on a hit)
+        cache_key = (gene, position, ref_allele, alt_allele, population)
+        with self._cache_lock:
+            if cache_key in self.frequency_cache:
+                self.frequency_cache.move_to_end(cache_key)
+                return self.frequency_cache[cache_key]
         
-        # Look up in common variants database
-        if variant_key in self.common_variants:
-            freq_data = self.common_variants[variant_key]
+        # Look up in the common and population-specific variant databases
+        freq_data = self._lookup_freq_record(ref_allele, alt_allele, gene, position)
+        if freq_data is not None:
             frequency = self._get_population_frequency(freq_data, population)
-            self.frequency_cache[cache_key] = frequency
-            return frequency
-        
-        # Check population-specific variants
-        for pop_group, variants in self.population_specific_variants.items():
-            if variant_key in variants:
-                freq_data = variants[variant_key]
-                frequency = self._get_population_frequency(freq_data, population)
-                self.frequency_cache[cache_key] = frequency
-                return frequency
+            return self._cache_frequency(cache_key, frequency)
         
         # Estimate frequency based on mutation type if not found
-        estimated_freq = self._estimate_frequency_by_mutation_type(ref_allele, alt_allele)
-        self.frequency_cache[cache_key] = estimated_freq
+        estimated_freq = self._estimate_by_mutation_type(ref_allele, alt_allele)
+        return self._cache_frequency(cache_key, estimated_freq)
+    
+    def _variant_key(self, ref_allele: str, alt_allele: str, gene: str, position: Optional[int]) -> str:
+        """Database key for a variant (mutation type only when the position is unknown)"""
+        if position:
+            chromosome = "17" if gene == "BRCA1" else "13"
+            return f"{chromosome}:{position}:{ref_allele}:{alt_allele}"
         
-        return estimated_freq
+        # Use mutation type for general lookup
+        return f"{ref_allele}>{alt_allele}"
+    
+    def _lookup_freq_record(self, ref_allele: str, alt_allele: str, gene: str,
+                            position: Optional[int] = None) -> Optional[VariantFrequency]:
+        """Known frequency record for a variant, or None"""
+        return self._all_variants.get(self._variant_key(ref_allele, alt_allele, gene, position))
+    
+    def _cache_frequency(self, cache_key: tuple, frequency: Optional[float]) -> Optional[float]:
+        """Store a frequency, evicting the least recently used entry when the cache is full"""
+        with self._cache_lock:
+            self.frequency_cache[cache_key] = frequency
+            if len(self.frequency_cache) > FREQUENCY_CACHE_SIZE:
+                self.frequency_cache.popitem(last=False)
+        return frequency
     
     def _get_population_frequency(self, freq_data: VariantFrequency, 
                                 population: PopulationGroup) -> float:
         """Extract frequency for specific population"""
         
-        if population == PopulationGroup.GLOBAL:
-            return freq_data.global_freq
-        elif population == PopulationGroup.EUROPEAN:
-            return freq_data.european_freq or freq_data.global_freq
-        elif population == PopulationGroup.AFRICAN:
-            return freq_data.african_freq or freq_data.global_freq
-        elif population == PopulationGroup.ASIAN:
-            return freq_data.asian_freq or freq_data.global_freq
-        elif population == PopulationGroup.LATINO:
-            return freq_data.latino_freq or freq_data.global_freq
-        elif population == PopulationGroup.ASHKENAZI_JEWISH:
-            return freq_data.ashkenazi_freq or freq_data.global_freq
-        else:
-            return freq_data.global_freq
+        # Missing (or zero) population frequencies fall back to the global frequency
+        return getattr(freq_data, self._POP_ATTR[population]) or freq_data.global_freq
     
-    def _estimate_frequency_by_mutation_type(self, ref: str, alt: str) -> Optional[float]:
+    def _estimate_frequency_by_mutation_type(self, ref: str, alt: str, jitter: bool = False) -> Optional[float]:
         """
         Estimate frequency based on mutation type when exact variant not found
-        Based on empirical data from large population studies
+        Based on empirical data from large population studies; `jitter` adds
+        random variation to simulate real populations (off by default so
+        estimates are reproducible)
         """
         
-        mutation_type = f"{ref}>{alt}"
-        
-        # Transition frequencies (more common)
-        transition_freqs = {
-            "A>G": 0.008,   # Common transition
-            "G>A": 0.007,   # Common transition
-            "C>T": 0.006,   # Common transition (CpG deamination)
-            "T>C": 0.005    # Common transition
-        }
-        
-        # Transversion frequencies (less common)
-        transversion_freqs = {
-            "A>T": 0.002,   # Less common
-            "T>A": 0.002,   # Less common
-            "A>C": 0.0015,  # Rare transversion
-            "C>A": 0.0015,  # Rare transversion
-            "G>C": 0.001,   # Rare transversion
-            "C>G": 0.001,   # Rare transversion
-            "G>T": 0.0018,  # Moderately rare
-            "T>G": 0.0018   # Moderately rare
-        }
-        
-        # Look up base frequency
-        if mutation_type in transition_freqs:
-            base_freq = transition_freqs[mutation_type]
-        elif mutation_type in transversion_freqs:
-            base_freq = transversion_freqs[mutation_type]
-        else:
-            # Very rare or complex mutation
-            base_freq = 0.0005
+        # Very rare or complex mutations get the default
+        base_freq = self._MUTATION_TYPE_FREQS.get(f"{ref}>{alt}", 0.0005)
         
-        # Add some randomness to simulate real population variation
-        variation_factor = random.uniform(0.5, 2.0)
-        estimated_freq = base_freq * variation_factor
+        if jitter:
+            base_freq *= random.uniform(0.5, 2.0)
         
         # Cap at reasonable maximum
-        return min(0.05, estimated_freq)
+        return min(0.05, base_freq)
     
     def classify_variant_by_frequency(self, frequency: float) -> str:
         """Classify variant rarity based on population frequency"""
         
-        if frequency >= self.thresholds['very_common']:
-            return "very_common"
-        elif frequency >= self.thresholds['common']:
-            return "common"
-        elif frequency >= self.thresholds['uncommon']:
-            return "uncommon"
-        elif frequency >= self.thresholds['rare']:
-            return "rare"
-        else:
-            return "very_rare"
+        # Label of the highest threshold not above the frequency; anything
+        # below the lowest threshold is very rare
+        index = bisect.bisect_right(self._threshold_values, frequency) - 1
+        return self._threshold_labels[max(index, 0)]
+    
+    def classify_frequencies(self, frequencies: Iterable[float]) -> List[str]:
+        """Vectorized classify_variant_by_frequency for many variants at once"""
+        labels = self._threshold_labels
+        return [labels[i] for i in self._frequency_class_indices(list(frequencies)).tolist()]
+    
+    def _frequency_class_indices(self, frequencies: List[float]) -> np.ndarray:
+        """Index into the ascending threshold labels for each frequency"""
+        index = np.searchsorted(self._threshold_values, np.asarray(frequencies, dtype=np.float64), side='right') - 1
+        return np.maximum(index, 0)
+    
+    def find_variants_above_frequency(self, population: PopulationGroup, min_frequency: float) -> List[str]:
+        """Keys of known variants whose frequency in `population` exceeds `min_frequency`"""
+        rows = np.flatnonzero(self._frequency_table[:, self._POP_COLUMN[population]] > min_frequency)
+        return [self._variant_keys[row] for row in rows.tolist()]
     
     def get_variant_annotation(self, ref_allele: str, alt_allele: str, gene: str,
                              position: Optional[int] = None) -> Dict[str, Any]:
@@ -298,12 +346,16 @@ class PopulationFrequencyDB:
         Get comprehensive annotation for a variant including population data
         """
         
-        # Get frequencies for all populations
-        frequencies = {}
-        for pop in PopulationGroup:
-            freq = self.get_frequency(ref_allele, alt_allele, gene, position, pop)
-            if freq is not None:
-                frequencies[pop.value] = freq
+        # Get frequencies for all populations (known variants: one table row)
+        row = self._variant_rows.get(self._variant_key(ref_allele, alt_allele, gene, position))
+        if row is not None:
+            frequencies = dict(zip(self._POP_VALUES, self._frequency_table[row].tolist()))
+        else:
+            frequencies = {}
+            for pop in PopulationGroup:
+                freq = self.get_frequency(ref_allele, alt_allele, gene, position, pop)
+                if freq is not None:
+                    frequencies[pop.value] = freq
         
         # Get global frequency for classification
         global_freq = frequencies.get('global', 0.001)
@@ -343,30 +395,15 @@ class PopulationFrequencyDB:
     def _check_founder_mutation(self, ref: str, alt: str, gene: str, position: Optional[int]) -> Dict[str, Any]:
         """Check if variant is a known founder mutation"""
         
-        founder_mutations = {
-            # Ashkenazi Jewish founder mutations
-            'ashkenazi': [
-                {'gene': 'BRCA1', 'mutation': '185delAG', 'ref': 'AG', 'alt': 'G'},
-                {'gene': 'BRCA1', 'mutation': '5382insC', 'ref': 'C', 'alt': 'CA'},
-                {'gene': 'BRCA2', 'mutation': '6174delT', 'ref': 'AT', 'alt': 'A'}
-            ],
-            # Other population founder mutations can be added here
-        }
-        
-        mutation_key = f"{ref}>{alt}" if len(ref) == 1 and len(alt) == 1 else f"{ref}:{alt}"
-        
-        for population, mutations in founder_mutations.items():
-            for mutation in mutations:
-                if (mutation['gene'] == gene and 
-                    ((mutation['ref'] == ref and mutation['alt'] == alt) or
-                     mutation_key in mutation.get('aliases', []))):
-                    
-                    return {
-                        'is_founder_mutation': True,
-                        'population': population,
-                        'mutation_name': mutation['mutation'],
-                        'clinical_significance': 'pathogenic'
-                    }
+        founder = self._FOUNDER_INDEX.get((gene, ref, alt))
+        if founder:
+            population, mutation_name = founder
+            return {
+                'is_founder_mutation': True,
+                'population': population,
+                'mutation_name': mutation_name,
+                'clinical_significance': 'pathogenic'
+            }
         
         return {'is_founder_mutation': False}
     
@@ -398,13 +435,17 @@ class PopulationFrequencyDB:
         total_variants = len(self.common_variants)
         pop_specific_count = sum(len(variants) for variants in self.population_specific_variants.values())
         
-        # Frequency distribution
-        all_freqs = [var.global_freq for var in self.common_variants.values()]
+        # Frequency distribution (one vectorized classification pass)
+        class_indices = self._frequency_class_indices([var.global_freq for var in self.common_variants.values()])
+        class_counts = dict(zip(
+            self._threshold_labels,
+            np.bincount(class_indices, minlength=len(self._threshold_labels)).tolist()
+        ))
         freq_distribution = {
-            'very_common': sum(1 for f in all_freqs if f >= self.thresholds['very_common']),
-            'common': sum(1 for f in all_freqs if self.thresholds['common'] <= f < self.thresholds['very_common']),
-            'uncommon': sum(1 for f in all_freqs if self.thresholds['uncommon'] <= f < self.thresholds['common']),
-            'rare': sum(1 for f in all_freqs if f < self.thresholds['uncommon'])
+            'very_common': class_counts['very_common'],
+            'common': class_counts['common'],
+            'uncommon': class_counts['uncommon'],
+            'rare': class_counts['rare'] + class_counts['very_rare']
         }
         
         return {
@@ -412,15 +453,17 @@ class PopulationFrequencyDB:
             'population_specific_variants': pop_specific_count,
             'cache_size': len(self.frequency_cache),
             'frequency_distribution': freq_distribution,
-            'populations_covered': [pop.value for pop in PopulationGroup],
+            'populations_covered': list(self._POP_VALUES),
             'data_sources': ['gnomAD_simulation', 'ExAC_simulation', 'BRCA_Exchange', 'ClinVar'],
             'version': '1.0.0'
         }
 
+# Shared instance: the variant tables are immutable, so one database per process suffices
+POP_DB = PopulationFrequencyDB()
+
 # Example usage and testing
 if __name__ == "__main__":
-    # Initialize population database
-    pop_db = PopulationFrequencyDB()
+    pop_db = POP_DB
     
     # Test frequency lookup
     test_variants = [
@@ -1,10 +1,17 @@
-import json
 import csv
-import xml.etree.ElementTree as ET
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List
 from datetime import datetime
-from io import StringIO, BytesIO
+from io import BytesIO
 import logging
+import orjson
+
+# lxml (libxml2) builds and serializes XML in C; fall back to the standard library
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
 # For PDF generation (optional)
 try:
@@ -18,8 +25,90 @@ except ImportError:
     PDF_AVAILABLE = False
     logging.warning("ReportLab not available. PDF export disabled.")
 
+if PDF_AVAILABLE:
+    # Style shared by the PDF tables (header row, beige body, grid)
+    _HEADER_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+# HTML-based PDF generation (optional): Jinja2 template rendered by WeasyPrint
+try:
+    from jinja2 import Environment
+    from weasyprint import HTML
+    HTML_PDF_AVAILABLE = True
+except ImportError:
+    HTML_PDF_AVAILABLE = False
+
+_PDF_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+  @page { size: A4; margin: 2cm; }
+  body { font-family: Helvetica, Arial, sans-serif; font-size: 10pt; }
+  h1 { font-size: 18pt; color: darkblue; margin-bottom: 30pt; }
+  h2 { font-size: 14pt; }
+  table { border-collapse: collapse; margin-bottom: 12pt; }
+  th, td { border: 1px solid black; padding: 4pt 6pt; text-align: left; }
+  th { background: grey; color: whitesmoke; font-weight: bold; font-size: 12pt; }
+  td { background: beige; }
+</style>
+</head>
+<body>
+<h1>SNPify Analysis Report</h1>
+<h2>Analysis Information</h2>
+<table>
+  <tr><th>Analysis ID:</th><th>{{ r.id }}</th></tr>
+  <tr><td>Status:</td><td>{{ r.status }}</td></tr>
+  <tr><td>Processing Time:</td><td>{{ '%.2f' % r.metadata.processing_time }} seconds</td></tr>
+  <tr><td>Quality Score:</td><td>{{ '%.1f' % r.metadata.quality_score }}%</td></tr>
+  <tr><td>Generated:</td><td>{{ generated }}</td></tr>
+</table>
+<h2>Analysis Summary</h2>
+<table>
+  <tr><th>Metric</th><th>Value</th></tr>
+  <tr><td>Total Variants</td><td>{{ r.summary.total_variants }}</td></tr>
+  <tr><td>Pathogenic Variants</td><td>{{ r.summary.pathogenic_variants }}</td></tr>
+  <tr><td>Likely Pathogenic</td><td>{{ r.summary.likely_pathogenic_variants }}</td></tr>
+  <tr><td>Uncertain Significance</td><td>{{ r.summary.uncertain_variants }}</td></tr>
+  <tr><td>Benign Variants</td><td>{{ r.summary.benign_variants }}</td></tr>
+  <tr><td>Overall Risk</td><td>{{ r.summary.overall_risk }}</td></tr>
+  <tr><td>Risk Score</td><td>{{ '%.1f' % r.summary.risk_score }}/10.0</td></tr>
+</table>
+</body>
+</html>
+"""
+
+# Compiled once per process
+_pdf_html_template = (
+    Environment(autoescape=True, auto_reload=False).from_string(_PDF_HTML_TEMPLATE)
+    if HTML_PDF_AVAILABLE else None
+)
+
 logger = logging.getLogger(__name__)
 
+_CSV_HEADER = [
+    'Variant_ID', 'Position', 'Chromosome', 'Gene', 'Reference_Allele',
+    'Alternative_Allele', 'RS_ID', 'Mutation', 'Consequence', 'Impact',
+    'Clinical_Significance', 'Confidence', 'Frequency', 'Sources'
+]
+
+class _LineBuffer:
+    """Write target for csv.writer that keeps only the last row written"""
+    
+    def __init__(self):
+        self.value = ''
+    
+    def write(self, row: str) -> None:
+        self.value = row
+
 class ReportGenerator:
     """Generate analysis reports in various formats"""
     
@@ -28,17 +117,92 @@ class ReportGenerator:
     
     def generate_json_report(self, analysis_result: Any) -> str:
         """Generate JSON report"""
+        return self._render_json_report(
+            analysis_result,
+            [self._json_variant(variant) for variant in analysis_result.variants]
+        )
+    
+    def generate_csv_report(self, analysis_result: Any) -> str:
+        """Generate CSV report"""
+        return ''.join(self.iter_csv_report(analysis_result))
+    
+    def iter_csv_report(self, analysis_result: Any) -> Iterator[str]:
+        """Yield the CSV report one row at a time (suitable for a streaming response)"""
+        line = _LineBuffer()
+        writer = csv.writer(line)
+        
+        # Write header
+        writer.writerow(_CSV_HEADER)
+        yield line.value
+        
+        # Write variant data
+        for variant in analysis_result.variants:
+            writer.writerow(self._csv_row(variant))
+            yield line.value
+    
+    def generate_xml_report(self, analysis_result: Any) -> str:
+        """Generate XML report"""
+        root, variants_elem = self._xml_skeleton(analysis_result)
+        for variant in analysis_result.variants:
+            self._add_xml_variant(variants_elem, variant)
+        
+        return ET.tostring(root, encoding='unicode')
+    
+    def generate_all(self, analysis_result: Any, formats: Iterable[str] = ('json', 'csv', 'xml')) -> Dict[str, str]:
+        """
+        Generate several text report formats with a single pass over the variants
+        Returns: {format: report}, each identical to the matching generate_*_report output
+        """
+        formats = tuple(formats)
+        unknown = set(formats) - {'json', 'csv', 'xml'}
+        if unknown:
+            raise ValueError(f"Unsupported report format(s): {', '.join(sorted(unknown))}")
+        
+        want_json = 'json' in formats
+        want_csv = 'csv' in formats
+        want_xml = 'xml' in formats
+        
+        json_variants = []
+        csv_lines = []
+        if want_csv:
+            line = _LineBuffer()
+            writer = csv.writer(line)
+            writer.writerow(_CSV_HEADER)
+            csv_lines.append(line.value)
+        if want_xml:
+            xml_root, variants_elem = self._xml_skeleton(analysis_result)
+        
+        for variant in analysis_result.variants:
+            if want_json:
+                json_variants.append(self._json_variant(variant))
+            if want_csv:
+                writer.writerow(self._csv_row(variant))
+                csv_lines.append(line.value)
+            if want_xml:
+                self._add_xml_variant(variants_elem, variant)
+        
+        reports = {}
+        if want_json:
+            reports['json'] = self._render_json_report(analysis_result, json_variants)
+        if want_csv:
+            reports['csv'] = ''.join(csv_lines)
+        if want_xml:
+            reports['xml'] = ET.tostring(xml_root, encoding='unicode')
+        return reports
+    
+    def _render_json_report(self, analysis_result: Any, variants: List[Dict[str, Any]]) -> str:
+        """Serialize the JSON report around already-built variant entries"""
         report_data = {
             "report_info": {
-                "generated_at": self.timestamp.isoformat(),
+                "generated_at": self.timestamp,
                 "version": "2.1.0",
                 "format": "JSON"
             },
             "analysis": {
                 "id": analysis_result.id,
                 "status": analysis_result.status,
-                "start_time": analysis_result.start_time.isoformat() if analysis_result.start_time else None,
-                "end_time": analysis_result.end_time.isoformat() if analysis_result.end_time else None,
+                "start_time": analysis_result.start_time or None,
+                "end_time": analysis_result.end_time or None,
                 "processing_time": analysis_result.metadata.processing_time
             },
             "summary": {
@@ -51,25 +215,7 @@ class ReportGenerator:
                 "risk_score": analysis_result.summary.risk_score,
                 "recommendations": analysis_result.summary.recommendations
             },
-            "variants": [
-                {
-                    "id": variant.id,
-                    "position": variant.position,
-                    "chromosome": variant.chromosome,
-                    "gene": variant.gene,
-                    "reference_allele": variant.ref_allele,
-                    "alternative_allele": variant.alt_allele,
-                    "rs_id": variant.rs_id,
-                    "mutation": variant.mutation,
-                    "consequence": variant.consequence,
-                    "impact": variant.impact,
-                    "clinical_significance": variant.clinical_significance,
-                    "confidence": variant.confidence,
-                    "frequency": variant.frequency,
-                    "sources": variant.sources
-                }
-                for variant in analysis_result.variants
-            ],
+            "variants": variants,
             "metadata": {
                 "input_type": analysis_result.metadata.input_type,
                 "file_name": analysis_result.metadata.file_name,
@@ -79,43 +225,51 @@ class ReportGenerator:
             }
         }
         
-        return json.dumps(report_data, indent=2, ensure_ascii=False)
+        # orjson writes datetimes as ISO 8601 and keeps non-ASCII text as UTF-8
+        return orjson.dumps(report_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
     
-    def generate_csv_report(self, analysis_result: Any) -> str:
-        """Generate CSV report"""
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            'Variant_ID', 'Position', 'Chromosome', 'Gene', 'Reference_Allele',
-            'Alternative_Allele', 'RS_ID', 'Mutation', 'Consequence', 'Impact',
-            'Clinical_Significance', 'Confidence', 'Frequency', 'Sources'
-        ])
-        
-        # Write variant data
-        for variant in analysis_result.variants:
-            writer.writerow([
-                variant.id,
-                variant.position,
-                variant.chromosome,
-                variant.gene,
-                variant.ref_allele,
-                variant.alt_allele,
-                variant.rs_id or '',
-                variant.mutation,
-                variant.consequence,
-                variant.impact,
-                variant.clinical_significance,
-                variant.confidence,
-                variant.frequency or '',
-                ';'.join(variant.sources)
-            ])
-        
-        return output.getvalue()
+    @staticmethod
+    def _json_variant(variant: Any) -> Dict[str, Any]:
+        """JSON report entry for one variant"""
+        return {
+            "id": variant.id,
+            "position": variant.position,
+            "chromosome": variant.chromosome,
+            "gene": variant.gene,
+            "reference_allele": variant.ref_allele,
+            "alternative_allele": variant.alt_allele,
+            "rs_id": variant.rs_id,
+            "mutation": variant.mutation,
+            "consequence": variant.consequence,
+            "impact": variant.impact,
+            "clinical_significance": variant.clinical_significance,
+            "confidence": variant.confidence,
+            "frequency": variant.frequency,
+            "sources": variant.sources
+        }
     
-    def generate_xml_report(self, analysis_result: Any) -> str:
-        """Generate XML report"""
+    @staticmethod
+    def _csv_row(variant: Any) -> List[Any]:
+        """CSV report row for one variant"""
+        return [
+            variant.id,
+            variant.position,
+            variant.chromosome,
+            variant.gene,
+            variant.ref_allele,
+            variant.alt_allele,
+            variant.rs_id or '',
+            variant.mutation,
+            variant.consequence,
+            variant.impact,
+            variant.clinical_significance,
+            variant.confidence,
+            variant.frequency or '',
+            ';'.join(variant.sources)
+        ]
+    
+    def _xml_skeleton(self, analysis_result: Any) -> tuple:
+        """XML report root with analysis info and summary; returns (root, variants element)"""
         root = ET.Element("snp_analysis")
         root.set("id", analysis_result.id)
         root.set("generated_at", self.timestamp.isoformat())
@@ -134,20 +288,21 @@ class ReportGenerator:
         ET.SubElement(summary, "risk_score").text = str(analysis_result.summary.risk_score)
         
         # Variants
-        variants_elem = ET.SubElement(root, "variants")
-        for variant in analysis_result.variants:
-            variant_elem = ET.SubElement(variants_elem, "variant")
-            variant_elem.set("id", variant.id)
-            
-            ET.SubElement(variant_elem, "position").text = str(variant.position)
-            ET.SubElement(variant_elem, "chromosome").text = variant.chromosome
-            ET.SubElement(variant_elem, "gene").text = variant.gene
-            ET.SubElement(variant_elem, "reference_allele").text = variant.ref_allele
-            ET.SubElement(variant_elem, "alternative_allele").text = variant.alt_allele
-            ET.SubElement(variant_elem, "clinical_significance").text = variant.clinical_significance
-            ET.SubElement(variant_elem, "confidence").text = str(variant.confidence)
+        return root, ET.SubElement(root, "variants")
+    
+    @staticmethod
+    def _add_xml_variant(variants_elem: Any, variant: Any) -> None:
+        """Append one <variant> element to the XML report"""
+        variant_elem = ET.SubElement(variants_elem, "variant")
+        variant_elem.set("id", variant.id)
         
-        return ET.tostring(root, encoding='unicode')
+        ET.SubElement(variant_elem, "position").text = str(variant.position)
+        ET.SubElement(variant_elem, "chromosome").text = variant.chromosome
+        ET.SubElement(variant_elem, "gene").text = variant.gene
+        ET.SubElement(variant_elem, "reference_allele").text = variant.ref_allele
+        ET.SubElement(variant_elem, "alternative_allele").text = variant.alt_allele
+        ET.SubElement(variant_elem, "clinical_significance").text = variant.clinical_significance
+        ET.SubElement(variant_elem, "confidence").text = str(variant.confidence)
     
     def generate_pdf_report(self, analysis_result: Any) -> bytes:
         """Generate PDF report"""
@@ -181,16 +336,7 @@ class ReportGenerator:
         ]
         
         info_table = Table(info_data, colWidths=[2*inch, 3*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        info_table.setStyle(_HEADER_TABLE_STYLE)
         story.append(info_table)
         story.append(Spacer(1, 12))
         
@@ -208,19 +354,21 @@ class ReportGenerator:
         ]
         
         summary_table = Table(summary_data, colWidths=[2.5*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        summary_table.setStyle(_HEADER_TABLE_STYLE)
         story.append(summary_table)
         
         # Build PDF
         doc.build(story)
         buffer.seek(0)
-        return buffer.read()
\ No newline at end of file
+        return buffer.read()
+    
+    def generate_pdf_report_via_html(self, analysis_result: Any) -> bytes:
+        """Generate the PDF report from an HTML template (Jinja2 + WeasyPrint)"""
+        if not HTML_PDF_AVAILABLE:
+            raise RuntimeError("HTML PDF generation not available. Install jinja2 and weasyprint packages.")
+        
+        html = _pdf_html_template.render(
+            r=analysis_result,
+            generated=self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        )
+        return HTML(string=html).write_pdf()